@@ -0,0 +1,231 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.routing import Mount
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli opsional: tanpa itu hanya varian gzip
+    brotli = None
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """``Accept-Encoding`` -> ``{token: q}``; q yang tidak valid dianggap 0."""
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def _encoders():
+    """(encoding, ekstensi file, fungsi kompres), urut dari yang paling disukai."""
+    encoders = [("gzip", ".gz", lambda b: gzip.compress(b, 9, mtime=0))]
+    if brotli is not None:
+        encoders.insert(0, ("br", ".br", lambda b: brotli.compress(b, quality=11)))
+    return encoders
+
+
+class StaticAssets(StaticFiles):
+    """StaticFiles dengan nama ber-fingerprint dan varian gzip/brotli siap saji.
+
+    ``css/custom.css`` dipublikasikan sebagai ``css/custom.<hash>.css`` yang
+    di-cache browser selamanya (``immutable``); isi berubah -> hash berubah.
+    Varian terkompresi dibuat ke ``CACHE_DIR/assets`` dan dipilih sesuai
+    ``Accept-Encoding``; ``manifest.json`` di sana dipakai ulang worker lain
+    selama masih lebih baru dari sumbernya. Folder upload tidak ikut
+    di-fingerprint.
+    """
+
+    def __init__(self, directory: str, build_dir: str, exclude: tuple[str, ...] = ()):
+        super().__init__(directory=directory)
+        self.build_dir = build_dir
+        self.exclude = tuple(e.strip("/") + "/" for e in exclude if e)
+        self._lock = threading.Lock()
+        self._manifest: dict[str, str] | None = None
+        self._reverse: dict[str, str] = {}
+        self._variants: dict[str, dict[str, str]] = {}
+
+    # ---------- build ----------
+    def _sources(self):
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith((".", "_"))]
+            for fname in files:
+                if fname.startswith("."):
+                    continue
+                full = os.path.join(root, fname)
+                rel = os.path.relpath(full, self.directory).replace(os.sep, "/")
+                if not rel.startswith(self.exclude):
+                    yield rel, full
+
+    def _compress(self, rel: str, full: str, data: bytes) -> dict[str, str]:
+        variants = {}
+        src_mtime = os.path.getmtime(full)
+        for encoding, ext, encode in _encoders():
+            dest = os.path.join(self.build_dir, rel + ext)
+            if not os.path.exists(dest) or os.path.getmtime(dest) < src_mtime:
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                tmp = f"{dest}.{os.getpid()}.part"
+                with open(tmp, "wb") as f:
+                    f.write(encode(data))
+                os.replace(tmp, dest)
+            variants[encoding] = dest
+        return variants
+
+    def build(self) -> dict[str, str]:
+        manifest, reverse, variants = {}, {}, {}
+        for rel, full in self._sources():
+            with open(full, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            base, ext = os.path.splitext(rel)
+            hashed = f"{base}.{digest}{ext}"
+            manifest[rel] = hashed
+            reverse[hashed] = rel
+            if ext.lower() in COMPRESSIBLE:
+                variants[rel] = self._compress(rel, full, data)
+        os.makedirs(self.build_dir, exist_ok=True)
+        # ditulis lewat file sementara: worker lain bisa sedang membacanya
+        path = os.path.join(self.build_dir, "manifest.json")
+        tmp = f"{path}.{os.getpid()}.part"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+        self._reverse, self._variants = reverse, variants
+        self._manifest = manifest
+        return manifest
+
+    def _load(self) -> bool:
+        """Pakai ``manifest.json`` build sebelumnya (deploy/worker lain) bila
+        daftar filenya sama dan lebih baru dari semua sumber: cukup stat, tanpa
+        membaca dan meng-hash ulang isi file."""
+        path = os.path.join(self.build_dir, "manifest.json")
+        try:
+            built = os.path.getmtime(path)
+            with open(path) as f:
+                manifest = json.load(f)
+            sources = dict(self._sources())
+            if manifest.keys() != sources.keys() or any(
+                os.path.getmtime(full) >= built for full in sources.values()
+            ):
+                return False
+        except (OSError, ValueError):
+            return False
+        variants = {}
+        for rel in manifest:
+            if os.path.splitext(rel)[1].lower() not in COMPRESSIBLE:
+                continue
+            found = {
+                encoding: os.path.join(self.build_dir, rel + ext)
+                for encoding, ext, _ in _encoders()
+            }
+            if not all(os.path.exists(dest) for dest in found.values()):
+                return False
+            variants[rel] = found
+        self._reverse = {hashed: rel for rel, hashed in manifest.items()}
+        self._variants = variants
+        self._manifest = manifest
+        return True
+
+    def manifest(self) -> dict[str, str]:
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None and not self._load():
+                    self.build()
+        return self._manifest
+
+    def fingerprint(self, path: str) -> str:
+        return self.manifest().get(path.lstrip("/"), path)
+
+    # ---------- serve ----------
+    async def get_response(self, path: str, scope):
+        self.manifest()
+        rel = self._reverse.get(path.replace(os.sep, "/"))
+        if rel is None:
+            response = await super().get_response(path, scope)
+            if path.replace(os.sep, "/") in self._manifest:
+                # URL tanpa hash: boleh di-cache tapi wajib revalidasi (ETag)
+                response.headers["Cache-Control"] = "no-cache"
+            return response
+        if scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        full_path, encoding, best = os.path.join(self.directory, rel), None, 0.0
+        # q tertinggi menang; bila sama, urutan varian (br lalu gzip); q=0 ditolak
+        for enc, variant in self._variants.get(rel, {}).items():
+            q = accepted.get(enc, accepted.get("*", 0.0))
+            if q > best:
+                full_path, encoding, best = variant, enc, q
+        stat_result = await anyio.to_thread.run_sync(os.stat, full_path)
+        headers = {"Cache-Control": IMMUTABLE}
+        if rel in self._variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=mimetypes.guess_type(rel)[0] or "text/plain",
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class AssetMount(Mount):
+    """Mount yang membuat ``url_for('static', path=...)`` menghasilkan URL ber-hash."""
+
+    def url_path_for(self, name: str, /, **path_params):
+        if name == self.name and "path" in path_params:
+            path_params["path"] = self.app.fingerprint(path_params["path"])
+        return super().url_path_for(name, **path_params)
+
+
+def _upload_subdir(static_dir: str) -> str:
+    rel = os.path.relpath(
+        os.path.abspath(settings.UPLOAD_FOLDER), os.path.abspath(static_dir)
+    )
+    return "" if rel.startswith("..") else rel.replace(os.sep, "/")
+
+
+def static_mount(directory: str = "app/static") -> AssetMount:
+    assets = StaticAssets(
+        directory=directory,
+        build_dir=os.path.join(settings.CACHE_DIR, "assets"),
+        exclude=(_upload_subdir(directory),),
+    )
+    return AssetMount("/static", app=assets, name="static")
+
+
+if __name__ == "__main__":
+    # python -m app.assets  -> bangun fingerprint + varian terkompresi saat deploy
+    mount = static_mount()
+    for src, hashed in sorted(mount.app.build().items()):
+        print(f"{src} -> {hashed}")
@@ -1,16 +1,119 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from fastapi import Request
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+from app.config import settings
+from app.sessions import is_revoked
+
+# scrypt/pbkdf2 di hashlib melepas GIL, jadi thread cukup; jumlah thread
+# membatasi berapa core yang boleh dipakai hashing sekaligus
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash"
+)
+# antrean dibatasi: lonjakan login ditolak cepat, bukan menumpuk di belakang
+_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE
+)
+
+
+class HashingBusy(Exception):
+    """Semua slot hashing terpakai; coba lagi sebentar lagi."""
+
 
 def hash_password(p: str) -> str:
-    return generate_password_hash(p)
+    return generate_password_hash(p, method=settings.PASSWORD_HASH_METHOD)
 
 def verify_password(p: str, hashed: str) -> bool:
     return check_password_hash(hashed, p)
 
+@functools.cache
+def _current_method() -> str:
+    # bentuk lengkap yang disimpan Werkzeug, mis. "scrypt" -> "scrypt:32768:8:1";
+    # disusun dari default Werkzeug, tanpa menghitung hash di event loop
+    method, *args = settings.PASSWORD_HASH_METHOD.split(":")
+    if method == "scrypt":
+        n, r, p = args or (2**15, 8, 1)
+        return f"scrypt:{n}:{r}:{p}"
+    if method == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    return settings.PASSWORD_HASH_METHOD
+
+def needs_rehash(hashed: str) -> bool:
+    return hashed.split("$", 1)[0] != _current_method()
+
+@functools.cache
+def _dummy_hash() -> str:
+    return hash_password("dummy-password")
+
+def _verify_dummy(p: str) -> bool:
+    # hash dummy dibuat (sekali) di thread executor, bukan di event loop
+    return verify_password(p, _dummy_hash())
+
+async def _run(func, *args):
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _slots.release()
+
+async def hash_password_async(p: str) -> str:
+    return await _run(hash_password, p)
+
+async def verify_password_async(p: str, hashed: Optional[str]) -> bool:
+    """Verifikasi di executor hashing; tanpa hash tetap menghitung hash dummy
+    agar waktu respons tidak membocorkan username mana yang ada."""
+    if not hashed:
+        await _run(_verify_dummy, p)
+        return False
+    return await _run(verify_password, p, hashed)
+
 def get_current_user(request: Request) -> Optional[dict]:
-    return request.session.get("user")
+    user = request.session.get("user")
+    if user and is_revoked(request.scope):
+        # sesi dicabut (logout/revoke) dari worker lain setelah dimuat ke cache
+        request.session.clear()
+        return None
+    return user
 
 def require_role(request: Request, role: str) -> bool:
     user = get_current_user(request)
     return bool(user and user.get("role") == role)
+
+
+def calibrate(target_ms: float, r: int = 8, p: int = 1, rounds: int = 3) -> str:
+    """Cari N scrypt terbesar yang waktu verifikasinya masih <= ``target_ms``."""
+    best = f"scrypt:{2 ** 12}:{r}:{p}"
+    for exp in range(12, 21):
+        method = f"scrypt:{2 ** exp}:{r}:{p}"
+        hashed = generate_password_hash("benchmark", method=method)
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            check_password_hash(hashed, "benchmark")
+            timings.append((time.perf_counter() - start) * 1000)
+        took = sorted(timings)[len(timings) // 2]
+        print(f"{method:<24} {took:8.1f} ms")
+        if took > target_ms:
+            break
+        best = method
+    return best
+
+
+if __name__ == "__main__":
+    # python -m app.auth [target_ms]  -> pilih biaya hash untuk server ini
+    import sys
+
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 100.0
+    print(f"PASSWORD_HASH_METHOD={calibrate(target)}")
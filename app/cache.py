@@ -0,0 +1,208 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+
+from app.config import settings
+from app.database import SessionLocal
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    body: bytes
+    status_code: int
+    headers: list[tuple[str, str]]
+    tags: dict[str, int]
+    stored_at: float
+
+
+class PageCache:
+    """Cache halaman hasil render (LRU + TTL) dengan invalidasi per tag.
+
+    Versi tiap tag disimpan sebagai mtime file penanda di ``CACHE_DIR`` agar
+    invalidasi dari satu worker Passenger terlihat oleh worker lain tanpa
+    query ke database. Entri yang TTL-nya baru lewat (< ``stale``) disajikan
+    sambil dirender ulang di belakang (stale-while-revalidate). Entri yang
+    kedaluwarsa/terinvalidasi tidak langsung dibuang: entri itu dipakai
+    sebagai salinan basi bila database tidak bisa dihubungi.
+    """
+
+    def __init__(self, directory: str, ttl: int, stale: int, max_entries: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _tag_path(self, tag: str) -> str:
+        return os.path.join(self.directory, f"{tag}.tag")
+
+    def tag_version(self, tag: str) -> int:
+        try:
+            return os.stat(self._tag_path(tag)).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def invalidate(self, *tags: str):
+        os.makedirs(self.directory, exist_ok=True)
+        for tag in tags:
+            path = self._tag_path(tag)
+            with open(path, "a"):
+                pass
+            # pastikan versi selalu naik meski resolusi mtime kasar
+            now = max(time.time_ns(), self.tag_version(tag) + 1)
+            os.utime(path, ns=(now, now))
+
+    def get(self, key: str) -> tuple[CachedPage | None, str]:
+        """Kembalikan ``(entry, status)``; entry None bila tidak ada sama sekali.
+
+        status ``fresh``, ``expired`` (TTL lewat kurang dari ``stale`` detik,
+        tag belum berubah: boleh disajikan sambil dirender ulang) atau
+        ``stale`` (harus dirender ulang sekarang).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, "stale"
+            self._entries.move_to_end(key)
+        if any(self.tag_version(tag) != version for tag, version in entry.tags.items()):
+            # data berubah (admin menyimpan): jangan tunda tampilnya
+            return entry, "stale"
+        age = time.monotonic() - entry.stored_at
+        if age < self.ttl:
+            return entry, "fresh"
+        return entry, "expired" if age < self.ttl + self.stale else "stale"
+
+    def set(self, key: str, entry: CachedPage):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def claim_refresh(self, key: str) -> bool:
+        """True bila pemanggil yang merender ulang ``key`` (satu per worker)."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def release_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+page_cache = PageCache(
+    os.path.join(settings.CACHE_DIR, "pages"),
+    ttl=settings.PAGE_CACHE_TTL,
+    stale=settings.PAGE_CACHE_STALE,
+    max_entries=settings.PAGE_CACHE_MAX_ENTRIES,
+)
+
+
+def _cache_key(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    # skema ikut kunci: halaman berisi URL absolut url_for (http vs https)
+    url = request.url
+    return f"{url.scheme}://{url.netloc}{url.path}?{query}"
+
+
+def _to_response(entry: CachedPage, state: str) -> Response:
+    response = Response(content=entry.body, status_code=entry.status_code)
+    response.raw_headers = [
+        (k.encode("latin-1"), v.encode("latin-1")) for k, v in entry.headers
+    ] + [(b"x-cache", state.encode())]
+    return response
+
+
+def _render(func, args, kwargs, key: str, tags: tuple[str, ...]) -> Response:
+    """Render route lalu simpan hasil 200 ke ``page_cache``."""
+    versions = {tag: page_cache.tag_version(tag) for tag in tags}
+    response = func(*args, **kwargs)
+    if response.status_code == 200:
+        headers = [
+            (k.decode("latin-1"), v.decode("latin-1"))
+            for k, v in response.raw_headers
+            if k.lower() != b"set-cookie"
+        ]
+        page_cache.set(
+            key,
+            CachedPage(
+                response.body,
+                response.status_code,
+                headers,
+                versions,
+                time.monotonic(),
+            ),
+        )
+    return response
+
+
+def _revalidate(func, args, kwargs, key: str, tags: tuple[str, ...]):
+    # session milik request sudah ditutup get_db: pakai session sendiri
+    try:
+        with SessionLocal() as db:
+            _render(func, args, kwargs | {"db": db}, key, tags)
+    except Exception as e:
+        # salinan lama tetap dipakai; dicoba lagi pada request berikutnya
+        log.warning("background refresh of %s failed: %s", key, e)
+    finally:
+        page_cache.release_refresh(key)
+
+
+def cached_page(*tags: str):
+    """Decorator route publik: sajikan dari ``page_cache``, render ulang bila basi.
+
+    Hanya untuk pengunjung anonim (navbar admin berbeda per sesi). Route harus
+    menerima ``db`` (``Depends(get_db)``) agar bisa dirender ulang di thread.
+    Bila render gagal karena database tidak terjangkau (termasuk pool habis),
+    salinan basi dikirim.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"]
+            if request.session.get("user"):
+                return func(*args, **kwargs)
+            key = _cache_key(request)
+            entry, status = page_cache.get(key)
+            if status == "fresh":
+                return _to_response(entry, "HIT")
+            if status == "expired":
+                if page_cache.claim_refresh(key):
+                    threading.Thread(
+                        target=_revalidate,
+                        args=(func, args, kwargs, key, tags),
+                        daemon=True,
+                    ).start()
+                return _to_response(entry, "STALE")
+            try:
+                response = _render(func, args, kwargs, key, tags)
+            except (DBAPIError, PoolTimeoutError) as e:
+                if entry is None:
+                    raise
+                log.warning("database unavailable, serving stale %s: %s", key, e)
+                return _to_response(entry, "STALE")
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,330 @@
+import functools
+import io
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, Optional
+from urllib.parse import quote
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.member import Member
+from app.thumbnails import generate, source_rel
+
+# tata letak lembar sama dengan @media print di admin/_member_card.html:
+# kartu CR80 86x54 mm, 2 kolom x 4 baris di A4 dengan margin 12 mm
+CARDS_PER_PAGE = 8
+COLUMNS = 2
+PAGE_MM = (210, 297)
+CARD_MM = (86, 54)
+MARGIN_MM = 12
+GAP_MM = (14, 10)
+PRINT_DPI = 200
+PHOTO_SIZE = "print"
+
+_pool: Optional[Executor] = None
+
+
+def parse_ids(text: str) -> list[int]:
+    """``"12, 15-18 30"`` -> ``[12, 15, 16, 17, 18, 30]``; ValueError bila salah.
+
+    Jumlah seluruh ID (bukan hanya per range) dibatasi ``CARD_BATCH_MAX``.
+    """
+    ids: list[int] = []
+    for part in text.replace(",", " ").split():
+        start, _, end = part.partition("-")
+        first = int(start)
+        last = int(end) if end else first
+        if last < first or len(ids) + last - first >= settings.CARD_BATCH_MAX:
+            raise ValueError(part)
+        ids.extend(range(first, last + 1))
+    return ids
+
+
+def card_rows(
+    db: Session,
+    ids: list[int],
+    joined_from: Optional[date],
+    joined_to: Optional[date],
+    membership_type: str,
+    limit: int,
+) -> list[dict]:
+    """Data kartu (dict biasa, bisa dikirim ke proses lain).
+
+    Mengambil ``limit`` baris; pemanggil membandingkan panjangnya untuk
+    mendeteksi filter yang terlalu luas.
+    """
+    stmt = select(
+        Member.id,
+        Member.name,
+        Member.email,
+        Member.phone,
+        Member.membership_type,
+        Member.photo,
+        Member.created_at,
+    )
+    if ids:
+        stmt = stmt.where(Member.id.in_(ids))
+    if joined_from:
+        stmt = stmt.where(Member.created_at >= datetime.combine(joined_from, time()))
+    if joined_to:
+        stmt = stmt.where(
+            Member.created_at < datetime.combine(joined_to + timedelta(days=1), time())
+        )
+    if membership_type:
+        stmt = stmt.where(Member.membership_type == membership_type)
+    # daftar ID dicetak urut ID; filter tanggal/jenis urut tanggal daftar
+    # (indeks created_at, id) agar tidak perlu sort
+    order = (Member.id,) if ids else (Member.created_at, Member.id)
+    rows = db.execute(stmt.order_by(*order).limit(limit)).mappings()
+    return [{**row, "photo_rel": source_rel(row["photo"])} for row in rows]
+
+
+def pages(rows: list[dict]) -> list[list[dict]]:
+    return [rows[i : i + CARDS_PER_PAGE] for i in range(0, len(rows), CARDS_PER_PAGE)]
+
+
+# ---------- dijalankan di proses pool ----------
+def _prepare_photos(cards: list[dict]) -> list[dict]:
+    # turunan ukuran cetak dibuat sekali lalu dipakai ulang (juga oleh /media/thumb)
+    for card in cards:
+        card["photo_path"] = (
+            generate(card["photo_rel"], PHOTO_SIZE, "jpg")
+            if card["photo_rel"]
+            else None
+        )
+    return cards
+
+
+def _px(mm: float) -> int:
+    return round(mm * PRINT_DPI / 25.4)
+
+
+@functools.cache
+def _font(size_mm: float, bold: bool = False):
+    from PIL import ImageFont
+
+    size = _px(size_mm)
+    try:
+        return ImageFont.truetype(
+            "DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf", size
+        )
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def _fit(draw, text: str, font, width: int) -> str:
+    # potong teks panjang (email) agar tidak keluar dari kartu
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(text + "…", font=font) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def _draw_card(sheet, card: dict, left: int, top: int):
+    from PIL import Image, ImageDraw, ImageOps
+
+    width, height = _px(CARD_MM[0]), _px(CARD_MM[1])
+    photo_width = width * 5 // 12
+    draw = ImageDraw.Draw(sheet)
+    draw.rectangle((left, top, left + photo_width, top + height), fill="#eaf2ff")
+    if card["photo_path"]:
+        try:
+            with Image.open(card["photo_path"]) as photo:
+                photo = ImageOps.fit(photo.convert("RGB"), (photo_width, height))
+                sheet.paste(photo, (left, top))
+        except OSError:
+            pass
+    draw.rounded_rectangle(
+        (left, top, left + width, top + height),
+        radius=_px(2),
+        outline="#c9d4e5",
+        width=2,
+    )
+
+    x, y = left + photo_width + _px(4), top + _px(4)
+    text_width = width - photo_width - _px(8)
+    draw.text((x, y), "Koperasi Kita", font=_font(3.2, True), fill="#0d6efd")
+    y += _px(6)
+    name = _fit(draw, card["name"], _font(4.2, True), text_width)
+    draw.text((x, y), name, font=_font(4.2, True), fill="#212529")
+    y += _px(6.5)
+    draw.text((x, y), f"ID: {card['id']}", font=_font(2.8), fill="#6c757d")
+    y += _px(5)
+    badge = card["membership_type"]
+    badge_width = draw.textlength(badge, font=_font(2.8)) + _px(4)
+    draw.rounded_rectangle(
+        (x, y, x + badge_width, y + _px(5)), radius=_px(2.5), fill="#cfe2ff"
+    )
+    draw.text((x + _px(2), y + _px(0.8)), badge, font=_font(2.8), fill="#052c65")
+    y += _px(7)
+    joined = card["created_at"].strftime("%d %b %Y")
+    draw.text((x, y), f"Bergabung: {joined}", font=_font(2.8), fill="#6c757d")
+    contact = _fit(draw, f"{card['email']} • {card['phone']}", _font(2.5), text_width)
+    draw.text((x, top + height - _px(7)), contact, font=_font(2.5), fill="#6c757d")
+
+
+def _render_page(cards: list[dict]) -> bytes:
+    """Satu halaman A4 berisi kartu, sebagai JPEG siap ditempel ke PDF."""
+    from PIL import Image
+
+    _prepare_photos(cards)
+    sheet = Image.new("RGB", (_px(PAGE_MM[0]), _px(PAGE_MM[1])), "white")
+    for i, card in enumerate(cards):
+        row, col = divmod(i, COLUMNS)
+        left = _px(MARGIN_MM + col * (CARD_MM[0] + GAP_MM[0]))
+        top = _px(MARGIN_MM + row * (CARD_MM[1] + GAP_MM[1]))
+        _draw_card(sheet, card, left, top)
+    out = io.BytesIO()
+    sheet.save(out, "JPEG", quality=85, dpi=(PRINT_DPI, PRINT_DPI))
+    return out.getvalue()
+
+
+# ---------- pool ----------
+def _spawn_safe() -> bool:
+    """True bila proses spawn tidak menjalankan ulang skrip ``__main__``.
+
+    Spawn mengimpor ulang ``__main__`` di setiap proses pool. Itu aman bila
+    server dijalankan sebagai modul (``python -m ...``) atau tanpa file, tapi
+    di Passenger ``__main__`` adalah skrip loader-nya sendiri.
+    """
+    main = sys.modules.get("__main__")
+    return (
+        getattr(main, "__spec__", None) is not None
+        or getattr(main, "__file__", None) is None
+    )
+
+
+def _get_pool() -> Optional[Executor]:
+    global _pool
+    if settings.CARD_WORKERS <= 0:
+        return None
+    if _pool is None:
+        if _spawn_safe():
+            # spawn: worker server bisa punya thread & koneksi DB yang tidak
+            # aman di-fork
+            _pool = ProcessPoolExecutor(
+                settings.CARD_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            # Pillow melepas GIL saat resize/encode, jadi thread tetap paralel
+            _pool = ThreadPoolExecutor(
+                settings.CARD_WORKERS, thread_name_prefix="card-worker"
+            )
+    return _pool
+
+
+def in_order(func, items: Iterable) -> Iterator:
+    """``map`` paralel yang hasilnya keluar urut dan bisa langsung di-stream.
+
+    Antrean dibatasi 2x jumlah worker agar batch besar tidak ditampung semua
+    di memori; sisa tugas dibatalkan bila klien memutus koneksi.
+    """
+    pool = _get_pool()
+    if pool is None:
+        yield from map(func, items)
+        return
+    window = deque()
+    try:
+        for item in items:
+            window.append(pool.submit(func, item))
+            if len(window) >= settings.CARD_WORKERS * 2:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+    finally:
+        for future in window:
+            future.cancel()
+
+
+def html_pages(rows: list[dict], photo_url) -> Iterator[list[dict]]:
+    """Halaman kartu untuk template; foto cetak disiapkan paralel lebih dulu."""
+    for cards in in_order(_prepare_photos, pages(rows)):
+        for card in cards:
+            card["photo_url"] = photo_url(card)
+        yield cards
+
+
+def thumb_url(base: str, static_base: str):
+    """URL foto kartu tanpa ``url_for`` per baris (lihat _photo.html)."""
+
+    def photo_url(card: dict) -> Optional[str]:
+        if card["photo_rel"]:
+            return base + quote(card["photo_rel"].replace("\\", "/"))
+        photo = card["photo"]
+        if photo and photo.startswith("static/"):
+            return static_base + photo[len("static/") :]
+        return photo
+
+    return photo_url
+
+
+# ---------- PDF ----------
+def _pdf_object(number: int, body: bytes) -> bytes:
+    return b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+
+def pdf_stream(rows: list[dict]) -> Iterator[bytes]:
+    """PDF berisi satu gambar JPEG per halaman, ditulis sambil halaman selesai.
+
+    Objek 1 (Catalog) dan 2 (Pages) ditulis terakhir karena daftar halaman
+    baru diketahui di akhir; xref mencatat offset tiap objek.
+    """
+    width_pt = b"%.2f" % (PAGE_MM[0] * 72 / 25.4)
+    height_pt = b"%.2f" % (PAGE_MM[1] * 72 / 25.4)
+    image_size = (_px(PAGE_MM[0]), _px(PAGE_MM[1]))
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    offsets: dict[int, int] = {}
+    position = len(header)
+    yield header
+
+    kids = []
+    for n, jpeg in enumerate(in_order(_render_page, pages(rows))):
+        image, content, page = 3 + 3 * n, 4 + 3 * n, 5 + 3 * n
+        draw = b"q %s 0 0 %s 0 0 cm /Im0 Do Q" % (width_pt, height_pt)
+        objects = [
+            (
+                image,
+                b"<< /Type /XObject /Subtype /Image /Width %d /Height %d "
+                b"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode "
+                b"/Length %d >>\nstream\n%s\nendstream"
+                % (*image_size, len(jpeg), jpeg),
+            ),
+            (content, b"<< /Length %d >>\nstream\n%s\nendstream" % (len(draw), draw)),
+            (
+                page,
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %s %s] "
+                b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+                % (width_pt, height_pt, image, content),
+            ),
+        ]
+        chunk = b""
+        for number, body in objects:
+            offsets[number] = position + len(chunk)
+            chunk += _pdf_object(number, body)
+        position += len(chunk)
+        kids.append(page)
+        yield chunk
+
+    refs = b" ".join(b"%d 0 R" % kid for kid in kids)
+    chunk = b""
+    for number, body in (
+        (2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (refs, len(kids))),
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+    ):
+        offsets[number] = position + len(chunk)
+        chunk += _pdf_object(number, body)
+    xref_at = position + len(chunk)
+    size = max(offsets) + 1
+    chunk += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    chunk += b"".join(b"%010d 00000 n \n" % offsets[i] for i in range(1, size))
+    chunk += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        size,
+        xref_at,
+    )
+    yield chunk
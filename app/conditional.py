@@ -0,0 +1,96 @@
+import functools
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import DateTime, inspect, select, text
+
+from app.templating import template_version
+
+
+def http_date(value: datetime) -> str:
+    """Datetime UTC naive -> format tanggal HTTP (Last-Modified)."""
+    return format_datetime(
+        value.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+    )
+
+
+def validators(model, id: int, updated_at: datetime) -> tuple[str, str]:
+    """``(ETag, Last-Modified)`` dari ``updated_at``; versi template ikut di ETag."""
+    stamp = int(updated_at.replace(tzinfo=timezone.utc).timestamp() * 1_000_000)
+    etag = f'W/"{model.__tablename__}-{id}-{stamp}-{template_version()}"'
+    return etag, http_date(updated_at)
+
+
+def is_not_modified(request: Request, etag: str, updated_at: datetime) -> bool:
+    # If-None-Match lebih diutamakan; If-Modified-Since hanya bila tidak ada
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return updated_at.replace(microsecond=0, tzinfo=timezone.utc) <= since
+
+
+def conditional_get(model, id_param: str):
+    """Decorator route detail: jawab 304 hanya dengan lookup ``updated_at`` via PK.
+
+    Dipasang di luar ``cached_page`` agar revalidasi tidak menyentuh cache
+    maupun template. Hanya untuk pengunjung anonim: navbar admin berbeda per
+    sesi, jadi respons yang login tidak diberi validator.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"]
+            if request.session.get("user"):
+                return func(*args, **kwargs)
+            id = kwargs[id_param]
+            updated_at = kwargs["db"].scalar(
+                select(model.updated_at).where(model.id == id)
+            )
+            if updated_at is None:
+                # tidak ada (404) atau baris lama tanpa updated_at
+                return func(*args, **kwargs)
+            etag, last_modified = validators(model, id, updated_at)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": last_modified,
+                "Cache-Control": "no-cache",
+            }
+            if is_not_modified(request, etag, updated_at):
+                return Response(status_code=304, headers=headers)
+            response = func(*args, **kwargs)
+            if response.status_code == 200:
+                response.headers.update(headers)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def ensure_updated_at(engine, models):
+    """Tambahkan kolom ``updated_at`` ke tabel lama lalu isi dari ``created_at``."""
+    inspector = inspect(engine)
+    for model in models:
+        table = model.__tablename__
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        if "updated_at" in columns:
+            continue
+        column_type = DateTime().compile(dialect=engine.dialect)
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN updated_at {column_type} NULL")
+            )
+            conn.execute(text(f"UPDATE {table} SET updated_at = created_at"))
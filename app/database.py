@@ -1,17 +1,112 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import logging
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
 
+log = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Penghitung checkout/tunggu/overflow pool (lihat ``pool_status()``)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.overflow_checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, waited: float, overflow: bool):
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+            # di bawah 1 ms dianggap tidak menunggu (koneksi tersedia di pool)
+            if waited >= 0.001:
+                self.waits += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "overflow_checkouts": self.overflow_checkouts,
+                "waits": self.waits,
+                "wait_time_ms": round(self.wait_time * 1000, 2),
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+            }
+
+
+class _TimedGetMixin:
+    def _create_connection(self):
+        with self.stats._lock:
+            self.stats.connects += 1
+        return super()._create_connection()
+
+    def _do_get(self):
+        # _do_get = ambil koneksi dari antrean (termasuk menunggu bila penuh)
+        # checkout ini memakai koneksi overflow bila semua slot pool_size sudah
+        # dipinjam sebelumnya (overflow() > 0 hanya berarti pool sedang penuh)
+        overflow = self.checkedout() >= self.size()
+        start = time.perf_counter()
+        entry = super()._do_get()
+        self.stats.record_checkout(time.perf_counter() - start, overflow)
+        return entry
+
+
+class InstrumentedQueuePool(_TimedGetMixin, QueuePool):
+    stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+
+def engine_options(url: str, poolclass) -> dict:
+    """Opsi pool dari Settings; recycle menggantikan ping per checkout."""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
 # engine = create_engine(
 #     settings.DATABASE_URL,
 #     connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
 #     echo=False,
 #     future=True,
 # )
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(
+    settings.DATABASE_URL,
+    **engine_options(settings.DATABASE_URL, InstrumentedQueuePool),
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 # SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# driver async per backend (dipilih dari DATABASE_URL)
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
 
 class Base(DeclarativeBase):
     pass
@@ -23,3 +118,108 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def async_url(url: str):
+    """``mysql+pymysql://...`` -> ``mysql+aiomysql://...``, ``sqlite://`` -> ``sqlite+aiosqlite://``."""
+    u = make_url(url)
+    driver = ASYNC_DRIVERS.get(u.get_backend_name())
+    if driver is None:
+        raise ValueError(f"no async driver for {u.get_backend_name()!r}")
+    return u.set(drivername=f"{u.get_backend_name()}+{driver}")
+
+
+_async_engine = None
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+def get_async_engine():
+    # dibuat saat pertama dipakai agar driver async hanya dibutuhkan bila dipakai
+    global _async_engine
+    if _async_engine is None:
+        url = async_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(
+            url, **engine_options(str(url), InstrumentedAsyncQueuePool)
+        )
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def warm_up_pool(n: int | None = None):
+    """Buka ``n`` koneksi sekaligus saat worker start lalu kembalikan ke pool."""
+    n = settings.DB_POOL_WARMUP if n is None else n
+    conns = []
+    try:
+        for _ in range(min(n, settings.DB_POOL_SIZE)):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def pool_status() -> dict:
+    status = {
+        "sync": {
+            "pool": engine.pool.status(),
+            **InstrumentedQueuePool.stats.as_dict(),
+        }
+    }
+    if _async_engine is not None:
+        status["async"] = {
+            "pool": _async_engine.pool.status(),
+            **InstrumentedAsyncQueuePool.stats.as_dict(),
+        }
+    return status
+
+
+async def get_async_db():
+    """Versi async dari ``get_db`` untuk handler ``async def`` (tanpa threadpool)."""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ---------- aksi setelah commit ----------
+# perubahan yang dikumpulkan event ORM per session, diterapkan ke state di luar
+# database (indeks, cache, worker) hanya bila transaksinya benar-benar commit
+_PENDING = "pending_after_commit"
+_commit_handlers: dict[str, Callable] = {}
+
+
+def on_commit(name: str):
+    """Daftarkan ``func(kumpulan)`` untuk perubahan ``name`` yang ter-commit."""
+
+    def decorator(func):
+        _commit_handlers[name] = func
+        return func
+
+    return decorator
+
+
+def pending(obj, name: str, factory: Callable = set):
+    """Kumpulan perubahan ``name`` di session ``obj`` (session atau objek ORM).
+
+    Diteruskan ke handler ``on_commit(name)`` setelah commit, dibuang bila
+    rollback. Objek tanpa session mendapat kumpulan sementara yang diabaikan.
+    """
+    session = obj if isinstance(obj, Session) else Session.object_session(obj)
+    if session is None:
+        return factory()
+    return session.info.setdefault(_PENDING, {}).setdefault(name, factory())
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session):
+    for name, changes in session.info.pop(_PENDING, {}).items():
+        try:
+            _commit_handlers[name](changes)
+        except Exception:
+            # data sudah ter-commit: handler lain tetap dijalankan
+            log.exception("after-commit handler %s failed", name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING, None)
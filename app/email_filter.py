@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.cache import page_cache
+from app.database import SessionLocal, on_commit, pending
+from app.models.member import Member
+
+log = logging.getLogger(__name__)
+
+# tag penanda (mtime file, lihat page_cache): anggota baru cukup diambil
+# berdasarkan created_at; email yang diubah/dihapus butuh bangun ulang
+TAG = "member-emails"
+REBUILD_TAG = "member-emails-rebuild"
+# sinkron berikutnya membaca ulang created_at sejauh ini ke belakang:
+# transaksi yang mencap created_at lebih awal bisa commit setelah sinkron
+SYNC_OVERLAP = timedelta(minutes=5)
+FALSE_POSITIVE_RATE = 0.01
+MIN_CAPACITY = 10_000
+
+
+def normalize_email(email: str) -> str:
+    """Bentuk email yang disimpan di ``members.email`` (lihat register/import)."""
+    return email.lower().strip()
+
+
+class BloomFilter:
+    """Himpunan probabilistik: ``False`` pasti tidak ada, ``True`` mungkin ada."""
+
+    def __init__(self, capacity: int, error_rate: float = FALSE_POSITIVE_RATE):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # double hashing (Kirsch-Mitzenmacher): k posisi dari satu digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str):
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value)
+        )
+
+
+class EmailFilter:
+    """Bloom filter email anggota di memori worker untuk cek ketersediaan.
+
+    Email yang tidak ada di filter pasti belum terdaftar, tanpa query; hanya
+    hasil positif yang dipastikan ke unique index ``members.email``. Anggota
+    baru (daftar/import) diambil per range ``created_at`` (dengan tumpang
+    tindih ``SYNC_OVERLAP``) setelah tag ``TAG`` berubah;
+    email yang diubah atau dihapus tidak bisa dikeluarkan dari filter, jadi
+    filter dibangun ulang (``REBUILD_TAG``).
+    """
+
+    def __init__(self):
+        self._filter: Optional[BloomFilter] = None
+        self._synced_at: Optional[datetime] = None
+        self._versions: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _sync(self, db: Session):
+        versions = (page_cache.tag_version(TAG), page_cache.tag_version(REBUILD_TAG))
+        if versions == self._versions:
+            return
+        with self._lock:
+            if versions == self._versions:
+                return
+            rebuild = self._versions is None or versions[1] != self._versions[1]
+            # dicatat sebelum query; yang commit sesudahnya terbaca sinkron berikutnya
+            started = datetime.utcnow()
+            if not rebuild:
+                rows = db.execute(
+                    select(Member.email).where(
+                        Member.created_at >= self._synced_at - SYNC_OVERLAP
+                    )
+                ).all()
+                # kapasitas habis -> false positive naik, bangun ulang lebih besar
+                rebuild = self._filter.count + len(rows) > self._filter.capacity
+            if rebuild:
+                rows = db.execute(select(Member.email)).all()
+                self._filter = BloomFilter(max(MIN_CAPACITY, 2 * len(rows)))
+            for row in rows:
+                # baris di jendela tumpang tindih tidak dihitung dua kali
+                if row.email not in self._filter:
+                    self._filter.add(row.email)
+            self._synced_at = started
+            self._versions = versions
+
+    def load(self):
+        """Bangun filter saat startup; dijalankan di thread agar boot tidak tertahan."""
+        try:
+            with SessionLocal() as db:
+                self._sync(db)
+        except Exception as e:
+            # dicoba lagi pada cek pertama
+            log.warning("email filter not loaded: %s", e)
+
+    def is_taken(self, db: Session, email: str) -> bool:
+        email = normalize_email(email)
+        self._sync(db)
+        if email not in self._filter:
+            return False
+        return (
+            db.scalar(select(Member.id).where(Member.email == email).limit(1))
+            is not None
+        )
+
+
+email_filter = EmailFilter()
+
+
+# ---------- tandai perubahan setelah commit (semua worker ikut sinkron) ----------
+@event.listens_for(Member, "after_insert")
+def _member_inserted(mapper, connection, target):
+    pending(target, "email_filter").add(TAG)
+
+
+@event.listens_for(Member, "after_update")
+def _member_updated(mapper, connection, target):
+    if inspect(target).attrs.email.history.has_changes():
+        pending(target, "email_filter").add(REBUILD_TAG)
+
+
+@event.listens_for(Member, "after_delete")
+def _member_deleted(mapper, connection, target):
+    pending(target, "email_filter").add(REBUILD_TAG)
+
+
+def mark_inserted(session: Session):
+    """Untuk insert lewat Core (import massal) yang tidak memicu event ORM."""
+    pending(session, "email_filter").add(TAG)
+
+
+@on_commit("email_filter")
+def _publish_changes(tags: set[str]):
+    page_cache.invalidate(*tags)
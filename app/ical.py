@@ -0,0 +1,178 @@
+import hashlib
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from markupsafe import Markup
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.cache import page_cache
+from app.models.activity import Activity
+
+# tag page_cache yang di-invalidate oleh CRUD kegiatan (app/routers/admin.py);
+# penghapusan memakai tag sendiri karena baris yang dihapus tidak bisa dicari
+TAG = "activities"
+DELETED_TAG = "activities-deleted"
+# kegiatan lebih lama dari ini tidak dimasukkan ke feed
+PAST_DAYS = 365
+# sinkron inkremental membaca ulang updated_at sejauh ini ke belakang: transaksi
+# yang mencap updated_at lebih awal bisa commit setelah sinkron sebelumnya
+SYNC_OVERLAP = timedelta(minutes=5)
+
+CALENDAR_NAME = "Kegiatan Koperasi Kita"
+UID_DOMAIN = "koperasi-kita"
+
+_COLUMNS = (
+    Activity.id,
+    Activity.title,
+    Activity.description,
+    Activity.date,
+    Activity.location,
+    Activity.updated_at,
+)
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Lipat baris > 75 oktet (RFC 5545 3.1), tanpa memotong karakter UTF-8."""
+    out, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > 75:
+            out.append(current)
+            current, size = " ", 1
+        current += char
+        size += width
+    out.append(current)
+    return "\r\n".join(out)
+
+
+def _stamp(value: Optional[datetime]) -> str:
+    return (value or datetime.utcnow()).strftime("%Y%m%dT%H%M%SZ")
+
+
+def vevent(row) -> str:
+    """Satu kegiatan sebagai VEVENT sehari penuh."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:activity-{row.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{_stamp(row.updated_at)}",
+        f"DTSTART;VALUE=DATE:{row.date:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{row.date + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_escape(row.title)}",
+    ]
+    if row.location:
+        lines.append(f"LOCATION:{_escape(row.location)}")
+    description = Markup(row.description or "").striptags()
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+class ActivityFeed:
+    """Feed .ics kegiatan yang disimpan di memori worker.
+
+    Poll biasa tidak menyentuh database: hanya membandingkan versi tag
+    ``activities`` (mtime file penanda, lihat ``page_cache``). Setelah
+    tambah/ubah kegiatan, hanya baris dengan ``updated_at`` sejak sinkron
+    terakhir (dikurangi ``SYNC_OVERLAP``) yang diambil dan VEVENT-nya dibuat
+    ulang; setelah penghapusan, feed dibangun ulang dari range tanggal
+    ber-index. Kegiatan yang lewat ``PAST_DAYS`` dikeluarkan saat render,
+    juga ketika tanggal berganti tanpa perubahan data.
+    """
+
+    def __init__(self):
+        self._events: dict[int, tuple[date, str]] = {}
+        self._versions: Optional[tuple[int, int]] = None
+        self._synced_at: Optional[datetime] = None
+        self._latest: Optional[datetime] = None
+        self._today: Optional[date] = None
+        self._lock = threading.Lock()
+        # (body, etag, last_modified) diganti utuh agar pembaca tidak melihat
+        # body dan etag dari dua versi berbeda
+        self._snapshot: tuple[bytes, str, datetime] = (b"", "", datetime.utcnow())
+
+    def get(self, db: Session) -> tuple[bytes, str, datetime]:
+        versions = (page_cache.tag_version(TAG), page_cache.tag_version(DELETED_TAG))
+        today = date.today()
+        if versions == self._versions and today == self._today:
+            return self._snapshot
+        with self._lock:
+            if versions != self._versions:
+                rebuild = self._versions is None or versions[1] != self._versions[1]
+                self._sync(db, rebuild, versions)
+                self._versions = versions
+            elif today != self._today:
+                self._render(self._snapshot[2])
+            self._today = today
+        return self._snapshot
+
+    def _sync(self, db: Session, rebuild: bool, versions: tuple[int, int]):
+        # dicatat sebelum query; yang commit sesudahnya terbaca sinkron berikutnya
+        started = datetime.utcnow()
+        cutoff = date.today() - timedelta(PAST_DAYS)
+        stmt = select(*_COLUMNS)
+        if rebuild:
+            self._events.clear()
+            self._latest = None
+            stmt = stmt.where(Activity.date >= cutoff)
+        else:
+            # batas tanggal dicek per baris, bukan di WHERE: kegiatan yang
+            # tanggalnya diubah ke sebelum cutoff harus ikut dikeluarkan
+            stmt = stmt.where(Activity.updated_at >= self._synced_at - SYNC_OVERLAP)
+        for row in db.execute(stmt):
+            if row.date < cutoff:
+                self._events.pop(row.id, None)
+            else:
+                self._events[row.id] = (row.date, vevent(row))
+            if row.updated_at and (
+                self._latest is None or row.updated_at > self._latest
+            ):
+                self._latest = row.updated_at
+        self._synced_at = started
+        # Last-Modified = waktu perubahan terakhir (mtime tag), sama di semua
+        # worker dan ikut maju saat kegiatan dihapus; updated_at terbaru saja
+        # tidak berubah bila yang terjadi hanya penghapusan
+        changed_at = self._latest or started
+        if max(versions):
+            changed_at = max(changed_at, datetime.utcfromtimestamp(max(versions) / 1e9))
+        self._render(changed_at)
+
+    def _render(self, changed_at: datetime):
+        cutoff = date.today() - timedelta(PAST_DAYS)
+        expired = [id for id, (day, _) in self._events.items() if day < cutoff]
+        for id in expired:
+            del self._events[id]
+        if expired:
+            # isi feed berubah tanpa ada data yang diubah: Last-Modified ikut maju
+            changed_at = max(changed_at, datetime.utcnow())
+        header = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:-//{UID_DOMAIN}//kegiatan//ID",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{CALENDAR_NAME}",
+            "X-PUBLISHED-TTL:PT1H",
+        ]
+        events = sorted(self._events.items(), key=lambda item: (item[1][0], item[0]))
+        body = "".join(line + "\r\n" for line in header)
+        body += "".join(event for _, (_, event) in events)
+        body += "END:VCALENDAR\r\n"
+        data = body.encode()
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        self._snapshot = (data, etag, changed_at)
+
+
+activity_feed = ActivityFeed()
@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, on_commit, pending
+from app.models.job import Job
+
+log = logging.getLogger(__name__)
+
+STATUSES = ("queued", "running", "done", "failed")
+# detik antar pembersihan job selesai yang melewati JOB_RETENTION_DAYS
+PURGE_INTERVAL = 3600
+
+_handlers: dict[str, Callable] = {}
+
+
+def handler(kind: str):
+    """Daftarkan fungsi sebagai pelaksana job ``kind``; payload jadi kwargs."""
+
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def enqueue(db, kind: str, **payload) -> Job:
+    """Tambahkan job ke session pemanggil; ikut tersimpan (atau batal) bersama
+    commit-nya, lalu worker dibangunkan setelah commit.
+
+    ``db`` boleh ``Session`` maupun ``AsyncSession``.
+    """
+    if kind not in _handlers:
+        raise KeyError(f"unknown job kind: {kind}")
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload, default=str),
+        status="queued",
+        attempts=0,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        run_at=datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.JOB_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def status_counts(db: Session) -> dict[str, int]:
+    rows = db.execute(
+        select(Job.status, func.count())
+        .where(Job.status.in_(STATUSES))
+        .group_by(Job.status)
+    )
+    return {status: 0 for status in STATUSES} | dict(rows.all())
+
+
+def retry(db: Session, id: int) -> bool:
+    """Jalankan ulang job yang gagal dari awal (jumlah percobaan di-reset)."""
+    result = db.execute(
+        update(Job)
+        .where(Job.id == id, Job.status == "failed")
+        .values(status="queued", attempts=0, run_at=datetime.utcnow(), finished_at=None)
+    )
+    db.commit()
+    if result.rowcount:
+        job_runner.wake()
+    return bool(result.rowcount)
+
+
+class JobRunner:
+    """Thread pelaksana job di setiap worker proses.
+
+    Job diklaim dengan UPDATE bersyarat (``status = 'queued'``) sehingga aman
+    dijalankan banyak proses sekaligus tanpa lock khusus database. Klaim
+    memasang lease ``run_at = now + JOB_TIMEOUT``; job ``running`` yang
+    lease-nya habis (proses mati di tengah jalan) dikembalikan ke antrean.
+    Job dari worker proses lain terambil lewat polling ``JOB_POLL_INTERVAL``.
+    """
+
+    def __init__(self):
+        self._threads: list[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._purged_at = 0.0
+        self._name = f"{socket.gethostname()}:{os.getpid()}"[:48]
+
+    def start(self, workers: int):
+        for n in range(workers):
+            thread = threading.Thread(
+                target=self._loop,
+                args=(f"{self._name}:{n}",),
+                name=f"job-worker-{n}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+        self._stop.clear()
+
+    def wake(self):
+        self._wake.set()
+
+    def _loop(self, worker: str):
+        while not self._stop.is_set():
+            # clear sebelum klaim: wake() yang datang selama klaim/eksekusi
+            # tetap membuat wait() di bawah langsung kembali
+            self._wake.clear()
+            try:
+                with SessionLocal() as db:
+                    job = self._claim(db, worker)
+                    if job is None:
+                        self._housekeeping(db)
+                if job is not None:
+                    self._run(job, worker)
+                    continue
+            except Exception:
+                # DB tidak bisa dihubungi dsb.: coba lagi pada polling berikutnya
+                log.exception("job worker error")
+            self._wake.wait(settings.JOB_POLL_INTERVAL)
+
+    def _claim(self, db: Session, worker: str) -> Optional[Job]:
+        now = datetime.utcnow()
+        while True:
+            id = db.scalar(
+                select(Job.id)
+                .where(Job.status == "queued", Job.run_at <= now)
+                .order_by(Job.run_at, Job.id)
+                .limit(1)
+            )
+            if id is None:
+                return None
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == id, Job.status == "queued")
+                .values(
+                    status="running",
+                    attempts=Job.attempts + 1,
+                    locked_by=worker,
+                    run_at=now + timedelta(seconds=settings.JOB_TIMEOUT),
+                )
+            ).rowcount
+            db.commit()
+            if claimed:
+                return db.get(Job, id)
+            # didahului worker lain -> ambil kandidat berikutnya
+
+    def _run(self, job: Job, worker: str):
+        error = None
+        func = _handlers.get(job.kind)
+        if func is None:
+            error = f"unknown job kind: {job.kind}"
+        else:
+            started = time.perf_counter()
+            try:
+                func(**json.loads(job.payload))
+            except Exception as e:
+                log.exception("job %s (%s) failed", job.id, job.kind)
+                error = f"{type(e).__name__}: {e}"
+            else:
+                log.info(
+                    "job %s (%s) done in %.0f ms",
+                    job.id,
+                    job.kind,
+                    (time.perf_counter() - started) * 1000,
+                )
+        now = datetime.utcnow()
+        if error is None:
+            values = dict(status="done", finished_at=now, last_error=None)
+        elif func is None or job.attempts >= job.max_attempts:
+            values = dict(status="failed", finished_at=now, last_error=error)
+        else:
+            values = dict(
+                status="queued",
+                run_at=now + retry_delay(job.attempts),
+                last_error=error,
+            )
+        with SessionLocal() as db:
+            # lease bisa sudah habis & job diklaim worker lain: jangan timpa
+            db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.locked_by == worker)
+                .where(Job.status == "running")
+                .values(**values)
+            )
+            db.commit()
+
+    def _housekeeping(self, db: Session):
+        now = datetime.utcnow()
+        expired = (Job.status == "running", Job.run_at <= now)
+        # cek dulu dengan SELECT: UPDATE kosong pun mengambil lock tulis SQLite
+        if db.scalar(select(Job.id).where(*expired).limit(1)) is not None:
+            # job yang membuat prosesnya mati tidak boleh diulang tanpa batas
+            db.execute(
+                update(Job)
+                .where(*expired, Job.attempts >= Job.max_attempts)
+                .values(status="failed", finished_at=now, last_error="lease expired")
+            )
+            db.execute(
+                update(Job)
+                .where(*expired)
+                .values(status="queued", run_at=now, last_error="lease expired")
+            )
+        if time.monotonic() - self._purged_at > PURGE_INTERVAL:
+            cutoff = now - timedelta(days=settings.JOB_RETENTION_DAYS)
+            db.execute(
+                Job.__table__.delete().where(
+                    Job.status == "done", Job.created_at < cutoff
+                )
+            )
+            self._purged_at = time.monotonic()
+        db.commit()
+
+
+job_runner = JobRunner()
+
+
+# ---------- bangunkan worker begitu job baru ter-commit ----------
+@event.listens_for(Job, "after_insert")
+def _job_inserted(mapper, connection, target):
+    pending(target, "jobs").add(target.id)
+
+
+@on_commit("jobs")
+def _wake_workers(ids: set[int]):
+    job_runner.wake()
+
+
+# ---------- daftar pelaksana job ----------
+# diimpor eksplisit di sini (bukan lewat efek samping import modul lain) agar
+# enqueue() dan worker selalu mengenal semua kind, di proses mana pun
+from app import thumbnails  # noqa: E402,F401
@@ -1,76 +1,75 @@
 import os
+import threading
 from fastapi import FastAPI
 from starlette.middleware.sessions import SessionMiddleware
-from fastapi.staticfiles import StaticFiles
+from app.assets import static_mount
 from app.config import settings
-from app.database import engine, Base
-from app.models.activity import Activity
-from app.models.news import News
+from app.database import engine, warm_up_pool
+from app.email_filter import email_filter
+from app.jobs import job_runner
+from app.profiling import SQLProfilerMiddleware, install as install_sql_profiler
 from app.routers.home import router as home_router
 from app.routers.members import router as members_router
 from app.routers.register import router as register_router
 from app.routers.admin import router as admin_router
 from app.routers.auth import router as auth_router
-from sqlalchemy.orm import Session
-from datetime import date
+from app.routers.media import router as media_router
+from app.routers.api import router as api_router
+from app.schema import ensure_schema
+from app.sessions import ServerSessionMiddleware, session_store
+from app.templating import precompile
+from app.uploads import FORM_OVERHEAD, MB, BodySizeLimitMiddleware
 
 app = FastAPI(title="Koperasi Kita ")
-app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+if session_store is None:
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key=settings.SECRET_KEY,
+        https_only=settings.SESSION_COOKIE_SECURE,
+    )
+else:
+    # cookie hanya berisi token; isi sesi di server (lihat app/sessions.py)
+    app.add_middleware(
+        ServerSessionMiddleware,
+        store=session_store,
+        https_only=settings.SESSION_COOKIE_SECURE,
+    )
+if settings.SQL_PROFILING:
+    install_sql_profiler()
+    app.add_middleware(SQLProfilerMiddleware)
+# paling luar: body kebesaran ditolak sebelum sesi dimuat atau multipart di-parse
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.MAX_CONTENT_LENGTH_MB * MB + FORM_OVERHEAD,
+    limits={"/admin/members/import": settings.MAX_IMPORT_MB * MB},
+)
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# /static dengan URL ber-fingerprint + gzip/brotli (lihat app/assets.py)
+app.router.routes.append(static_mount("app/static"))
 
 app.include_router(home_router)
 app.include_router(members_router)
 app.include_router(register_router)
 app.include_router(admin_router)
 app.include_router(auth_router)
+app.include_router(media_router)
+app.include_router(api_router)
 
 
 @app.on_event("startup")
 def on_startup():
+    # cukup satu query bila skema sudah versi terbaru; data awal lewat
+    # "python -m app.seed", bukan di setiap worker
     os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
-    Base.metadata.create_all(bind=engine)
-    with Session(engine) as db:
-        if not db.query(Activity).first():
-            db.add_all(
-                [
-                    Activity(
-                        title="Rapat Anggota Tahunan",
-                        description="Pembahasan laporan keuangan dan program kerja.",
-                        date=date(2025, 3, 15),
-                        location="Aula Koperasi",
-                    ),
-                    Activity(
-                        title="Pelatihan UMKM",
-                        description="Workshop pemasaran digital untuk anggota.",
-                        date=date(2025, 5, 20),
-                        location="Ruang Pelatihan",
-                    ),
-                ]
-            )
-        if not db.query(News).first():
-            db.add_all(
-                [
-                    News(
-                        title="Koperasi Luncurkan Program Simpanan Berjangka",
-                        body="Program baru dengan bunga kompetitif untuk anggota.",
-                    ),
-                    News(
-                        title="Kerja Sama dengan Bank Lokal",
-                        body="Mempermudah akses modal bagi anggota UMKM.",
-                    ),
-                ]
-            )
-    # ensure default admin user exists
-    from app.models.user import User
-    from app.auth import hash_password
+    ensure_schema(engine)
+    if settings.TEMPLATE_PRECOMPILE:
+        precompile()
+    warm_up_pool()
+    threading.Thread(target=email_filter.load, daemon=True).start()
+    job_runner.start(settings.JOB_WORKERS)
 
-    username = os.environ.get("ADMIN_USER", "admin")
-    password = os.environ.get("ADMIN_PASS", "admin123")
-    existing = db.query(User).filter(User.username == username).first()
-    if not existing:
-        db.add(
-            User(username=username, password_hash=hash_password(password), role="admin")
-        )
-        db.commit()
-        db.commit()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # job yang sedang berjalan diberi waktu selesai; sisanya tetap di tabel jobs
+    job_runner.stop()
@@ -0,0 +1,289 @@
+import csv
+import io
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, pending
+from app.email_filter import mark_inserted, normalize_email
+from app.models.member import Member
+from app.schemas.member import MemberCreate
+from app.stats import bump_members
+
+# kolom file import/export; id & created_at diabaikan saat import
+IMPORT_FIELDS = list(MemberCreate.model_fields)
+EXPORT_FIELDS = ["id", *IMPORT_FIELDS, "created_at"]
+# batas baris error yang disimpan untuk ditampilkan (sisanya hanya dihitung)
+MAX_REPORTED_ERRORS = 500
+# (nomor baris, nilai tervalidasi, kolom yang terisi di file)
+Row = tuple[int, dict, set[str]]
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+# ---------- baca file baris per baris ----------
+def _cell(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        # angka dari Excel (mis. no. HP) -> tanpa ".0"
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _csv_rows(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    first = text.readline()
+    # ekspor Excel berlokal Indonesia memakai ';' sebagai pemisah
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    yield from csv.reader([first], delimiter=delimiter)
+    yield from csv.reader(text, delimiter=delimiter)
+
+
+def _xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("Import XLSX membutuhkan paket openpyxl.")
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(fileobj, filename: str):
+    """Yield ``(nomor_baris, dict)`` dari CSV/XLSX tanpa memuat seluruh file."""
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext == "csv":
+        rows = _csv_rows(fileobj)
+    elif ext == "xlsx":
+        rows = _xlsx_rows(fileobj)
+    else:
+        raise ImportFormatError("Format file harus .csv atau .xlsx.")
+
+    header = next(rows, None)
+    if not header:
+        raise ImportFormatError("File kosong.")
+    columns = [str(h or "").strip().lower() for h in header]
+    missing = [f for f in ("name", "email", "phone") if f not in columns]
+    if missing:
+        raise ImportFormatError("Kolom wajib tidak ada: " + ", ".join(missing))
+
+    for line, row in enumerate(rows, start=2):
+        values = {
+            col: _cell(value)
+            for col, value in zip(columns, row)
+            if col in IMPORT_FIELDS
+        }
+        if any(v is not None for v in values.values()):
+            yield line, values
+
+
+# ---------- import ----------
+def _insert_ignore(db: Session, rows: list[dict]):
+    """INSERT multi-baris; email yang sudah ada dilewati oleh unique index."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(Member).on_conflict_do_nothing(index_elements=["email"])
+    elif dialect == "mysql":
+        stmt = mysql_insert(Member).prefix_with("IGNORE")
+    else:
+        stmt = insert(Member)
+    db.execute(stmt.values(rows))
+
+
+def _flush_batch(db: Session, batch: list[Row], update, report):
+    emails = [values["email"] for _, values, _ in batch]
+    if update:
+        existing = {
+            m.email: m
+            for m in db.scalars(select(Member).where(Member.email.in_(emails)))
+        }
+    else:
+        existing = set(
+            db.scalars(select(Member.email).where(Member.email.in_(emails)))
+        )
+
+    fresh = []
+    for line, values, provided in batch:
+        if values["email"] not in existing:
+            fresh.append(values)
+        elif update:
+            # hanya kolom yang terisi di file; kolom lain tidak ditimpa default
+            member = existing[values["email"]]
+            for key in provided:
+                setattr(member, key, values[key])
+            report.updated += 1
+        else:
+            report.skipped += 1
+
+    if fresh:
+        # tanpa mikrodetik: DATETIME MySQL tidak menyimpannya
+        now = datetime.utcnow().replace(microsecond=0)
+        for values in fresh:
+            values["created_at"] = values["updated_at"] = now
+        _insert_ignore(db, fresh)
+        # baca balik id baris baru (email unik) untuk indeks pencarian & rollup
+        saved = db.execute(
+            select(
+                Member.id,
+                Member.name,
+                Member.occupation,
+                Member.email,
+                Member.membership_type,
+                Member.dob,
+                Member.created_at,
+            ).where(
+                Member.email.in_([v["email"] for v in fresh]),
+                Member.created_at == now,
+            )
+        ).all()
+        # baris yang didahului pendaftaran lain di tengah import -> sudah terdaftar
+        report.skipped += len(fresh) - len(saved)
+        report.inserted += len(saved)
+        bump_members(
+            db.connection(),
+            [(r.membership_type, r.dob, r.created_at) for r in saved],
+        )
+        upserts = pending(db, "search", dict)
+        for r in saved:
+            upserts[r.id] = (r.name, r.occupation, r.email)
+        mark_inserted(db)
+    db.commit()
+
+
+def _save_batch(db: Session, batch: list[Row], update, report):
+    """``_flush_batch`` yang tahan error database (mis. data terlalu panjang).
+
+    Hitungan baru masuk ke ``report`` setelah commit berhasil. Bila batch
+    ditolak, batch di-rollback lalu dicoba per baris agar hanya baris yang
+    bermasalah dilaporkan.
+    """
+    result = ImportReport()
+    try:
+        _flush_batch(db, batch, update, result)
+    except DBAPIError as e:
+        db.rollback()
+        if len(batch) > 1:
+            for row in batch:
+                _save_batch(db, [row], update, report)
+        else:
+            report.error(batch[0][0], f"gagal disimpan: {e.orig}")
+        return
+    report.inserted += result.inserted
+    report.updated += result.updated
+    report.skipped += result.skipped
+
+
+def import_members(db: Session, fileobj, filename: str, update: bool = False):
+    """Validasi tiap baris dengan ``MemberCreate`` lalu simpan per batch.
+
+    Email yang sudah terdaftar dilewati, atau diperbarui bila ``update``
+    (hanya kolom yang ada dan terisi di file; sel kosong tidak menghapus data).
+    Tiap batch di-commit sendiri sehingga baris yang valid tetap tersimpan.
+    """
+    report = ImportReport()
+    batch: list[Row] = []
+    seen: set[str] = set()
+    for line, values in read_rows(fileobj, filename):
+        try:
+            member = MemberCreate.model_validate(
+                {k: v for k, v in values.items() if v is not None}
+            )
+        except ValidationError as e:
+            report.error(
+                line,
+                "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                    for err in e.errors()
+                ),
+            )
+            continue
+        data = member.model_dump()
+        data["email"] = normalize_email(data["email"])
+        if data["email"] in seen:
+            report.error(line, f"email: duplikat di dalam file ({data['email']})")
+            continue
+        seen.add(data["email"])
+        batch.append((line, data, member.model_fields_set))
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            _save_batch(db, batch, update, report)
+            batch = []
+    if batch:
+        _save_batch(db, batch, update, report)
+    return report
+
+
+# ---------- export ----------
+def _export_rows():
+    # session sendiri: dependency get_db sudah ditutup saat response di-stream
+    with SessionLocal() as db:
+        stmt = (
+            select(*[getattr(Member, f) for f in EXPORT_FIELDS])
+            .order_by(Member.id)
+            .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        )
+        for row in db.execute(stmt):
+            yield row
+
+
+def export_csv():
+    """Generator CSV; baris diambil bertahap dari server-side cursor."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # BOM agar Excel membaca UTF-8
+    writer.writerow(EXPORT_FIELDS)
+    for n, row in enumerate(_export_rows(), start=1):
+        writer.writerow(
+            [v.isoformat(sep=" ") if isinstance(v, datetime) else v for v in row]
+        )
+        if n % settings.EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def export_xlsx() -> str:
+    """Tulis XLSX ke file sementara (mode write-only, baris tidak ditahan di memori)."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Anggota")
+    sheet.append(EXPORT_FIELDS)
+    for row in _export_rows():
+        sheet.append(list(row))
+    tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    tmp.close()
+    workbook.save(tmp.name)
+    return tmp.name
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, Date, DateTime
+from sqlalchemy import Index, Integer, String, Text, Date, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, date
 from app.database import Base
@@ -6,9 +6,19 @@ from app.database import Base
 
 class Activity(Base):
     __tablename__ = "activities"
+    # daftar/kalender kegiatan menurut tanggal; updated_at untuk sinkron
+    # inkremental feed .ics (app/ical.py)
+    __table_args__ = (
+        Index("ix_activities_date_id", "date", "id"),
+        Index("ix_activities_updated_at", "updated_at"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     date: Mapped[date] = mapped_column(Date, nullable=False)
     location: Mapped[str | None] = mapped_column(String(200), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # kunci kesegaran untuk ETag/Last-Modified (lihat app/conditional.py)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Index, Integer, String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.database import Base
+
+
+class Job(Base):
+    """Antrean pekerjaan latar yang tahan restart (app/jobs.py)."""
+
+    __tablename__ = "jobs"
+    # ambil job siap jalan (status, run_at) & daftar admin per status (created_at, id)
+    __table_args__ = (
+        Index("ix_jobs_status_run_at_id", "status", "run_at", "id"),
+        Index("ix_jobs_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    # queued -> running -> done | failed (kembali ke queued bila dicoba ulang)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    # queued: paling cepat dijalankan; running: batas lease sebelum diambil ulang
+    run_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    locked_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, Date, DateTime
+from sqlalchemy import Index, Integer, String, Text, Date, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, date
 from app.database import Base
@@ -6,6 +6,12 @@ from app.database import Base
 
 class Member(Base):
     __tablename__ = "members"
+    # urutan daftar & keyset pagination (created_at desc, id desc)
+    # cetak kartu massal per jenis anggota (app/cards.py) dengan urutan yang sama
+    __table_args__ = (
+        Index("ix_members_created_at_id", "created_at", "id"),
+        Index("ix_members_type_created_at_id", "membership_type", "created_at", "id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     email: Mapped[str] = mapped_column(
@@ -13,10 +19,15 @@ class Member(Base):
     )
     phone: Mapped[str] = mapped_column(String(32), nullable=False)
     address: Mapped[str | None] = mapped_column(Text, nullable=True)
-    dob: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # active_history: nilai lama dibutuhkan rollup dashboard (app/stats.py)
+    dob: Mapped[date | None] = mapped_column(Date, nullable=True, active_history=True)
     occupation: Mapped[str | None] = mapped_column(String(120), nullable=True)
     membership_type: Mapped[str] = mapped_column(
-        String(32), nullable=False, default="Reguler"
+        String(32), nullable=False, default="Reguler", active_history=True
     )
     photo: Mapped[str | None] = mapped_column(String(256), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # kunci kesegaran untuk ETag/Last-Modified (lihat app/conditional.py)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, DateTime
+from sqlalchemy import Index, Integer, String, Text, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from app.database import Base
@@ -6,7 +6,13 @@ from app.database import Base
 
 class News(Base):
     __tablename__ = "news"
+    # urutan daftar & keyset pagination (created_at desc, id desc)
+    __table_args__ = (Index("ix_news_created_at_id", "created_at", "id"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     body: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # kunci kesegaran untuk ETag/Last-Modified (lihat app/conditional.py)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class StatCounter(Base):
+    """Rollup penghitung dashboard, diperbarui bertahap (lihat app/stats.py)."""
+
+    __tablename__ = "stat_counters"
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(64), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,69 @@
+import base64
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, or_
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[tuple[datetime, int]]:
+    """Kembalikan (created_at, id) dari cursor, atau None bila tidak valid."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, id_ = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(id_)
+    except Exception:
+        return None
+
+
+def keyset_page(
+    query,
+    created_col,
+    id_col,
+    cursor: str = "",
+    limit: int = 24,
+    descending: bool = True,
+):
+    """Ambil satu halaman urut (created_at desc, id desc) dengan keyset pagination.
+
+    Mengembalikan ``(items, next_cursor)``; ``next_cursor`` None bila sudah
+    halaman terakhir. Tidak memakai OFFSET sehingga biaya per halaman tetap.
+    ``created_col`` boleh kolom Date (``Activity.date``); indeks komposit
+    (kolom, id) di model membuat query ini tanpa sort. ``descending=False``
+    untuk urutan naik (kegiatan yang akan datang).
+    """
+    pos = decode_cursor(cursor)
+    if pos:
+        ts, last_id = pos
+        if not isinstance(created_col.type, DateTime):
+            ts = ts.date()
+        # "kolom <= ts" lebih dulu: range pada kolom depan indeks (kolom, id)
+        # sehingga database mulai membaca dari posisi cursor; dengan OR saja
+        # SQLite/MySQL memindai indeks dari awal untuk setiap halaman
+        if descending:
+            query = query.filter(
+                created_col <= ts, or_(created_col < ts, id_col < last_id)
+            )
+        else:
+            query = query.filter(
+                created_col >= ts, or_(created_col > ts, id_col > last_id)
+            )
+    if descending:
+        order = (created_col.desc(), id_col.desc())
+    else:
+        order = (created_col.asc(), id_col.asc())
+    rows = query.order_by(*order).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_col.key), getattr(last, id_col.key)
+        )
+    return items, next_cursor
@@ -0,0 +1,132 @@
+import heapq
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+class RequestProfile:
+    __slots__ = ("count", "db_time", "shapes", "slowest")
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.slowest: list[tuple[float, str]] = []
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("sql_profile", default=None)
+
+# nama route -> min-heap (durasi, bentuk statement) berisi N statement terlambat
+_slow_lock = threading.Lock()
+_slow_by_route: dict[str, list[tuple[float, str]]] = defaultdict(list)
+
+
+def statement_shape(statement: str) -> str:
+    """Bentuk statement tanpa variasi panjang daftar IN dan spasi."""
+    return _IN_LIST.sub("(?...)", _SPACES.sub(" ", statement).strip())
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("sql_profile_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    starts = conn.info.get("sql_profile_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    shape = statement_shape(statement)
+    profile.count += 1
+    profile.db_time += elapsed
+    profile.shapes[shape] += 1
+    profile.slowest.append((elapsed, shape))
+
+
+def install():
+    """Pasang listener ke semua Engine (sync maupun engine di balik async)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_execute):
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+
+
+def _record_route(route: str, profile: RequestProfile):
+    for shape, n in profile.shapes.items():
+        if n > settings.SQL_NPLUS1_THRESHOLD:
+            log.warning(
+                "possible N+1 on %s: %d executions of %s", route, n, shape[:200]
+            )
+    top_n = settings.SQL_SLOW_TOP_N
+    with _slow_lock:
+        heap = _slow_by_route[route]
+        for item in profile.slowest:
+            if len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+
+def slow_statements() -> dict[str, list[dict]]:
+    with _slow_lock:
+        return {
+            route: [
+                {"ms": round(elapsed * 1000, 2), "statement": shape}
+                for elapsed, shape in sorted(heap, reverse=True)
+            ]
+            for route, heap in _slow_by_route.items()
+        }
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "name", None) or scope.get("path", "?")
+
+
+class SQLProfilerMiddleware:
+    """Hitung query & waktu DB per request, kirim sebagai header ``Server-Timing``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={profile.db_time * 1000:.1f};desc="{profile.count} queries", '
+                    f"app;dur={total:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", timing.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if profile.count:
+                _record_route(_route_name(scope), profile)
@@ -1,25 +1,60 @@
-from datetime import datetime
 import os
+from datetime import date, datetime
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Request, Depends, Form, UploadFile, File
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
+from app.templating import templates
 from starlette import status
+from starlette.background import BackgroundTask
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
-from app.database import get_db
+from app.database import get_async_db, get_db, pool_status
+from app.profiling import slow_statements
 from app.models.activity import Activity
+from app.models.job import Job
 from app.models.news import News
 from app.models.member import Member
 from app.config import settings
+from app.cards import (
+    CARDS_PER_PAGE,
+    PHOTO_SIZE,
+    card_rows,
+    html_pages,
+    parse_ids,
+    pdf_stream,
+    thumb_url,
+)
+from app.pagination import keyset_page
+from app.member_io import ImportFormatError, export_csv, export_xlsx, import_members
+from app.search import search_page
+from app.sessions import session_store
+from app.cache import page_cache
+from app.email_filter import normalize_email
+from app.jobs import (
+    STATUSES as JOB_STATUSES,
+    enqueue,
+    retry as retry_job,
+    status_counts,
+)
+from app.ical import DELETED_TAG
+from app.stats import dashboard_stats
+from app.uploads import UploadTooLarge, allowed_file, save_upload
 
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 import secrets
-from werkzeug.utils import secure_filename
 
-templates = Jinja2Templates(directory="app/templates")
+ADMIN_PAGE_SIZE = 50
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 security = HTTPBasic()
@@ -37,24 +72,103 @@ def require_admin(request: Request):
 def dashboard(
     request: Request, db: Session = Depends(get_db), _: bool = Depends(require_admin)
 ):
-    stats = {
-        "members": db.query(Member).count(),
-        "activities": db.query(Activity).count(),
-        "news": db.query(News).count(),
-    }
+    stats = dashboard_stats(db)
     return templates.TemplateResponse(
         "admin/dashboard.html", {"request": request, "stats": stats}
     )
 
 
+@router.get("/pool", name="admin_pool")
+def pool(_: bool = Depends(require_admin)):
+    # statistik pool koneksi DB worker ini (JSON)
+    return pool_status()
+
+
+@router.get("/sql-profile", name="admin_sql_profile")
+def sql_profile(_: bool = Depends(require_admin)):
+    # statement terlambat per route (aktif bila SQL_PROFILING=1)
+    return slow_statements()
+
+
+@router.get("/sessions", name="admin_sessions")
+def sessions(_: bool = Depends(require_admin)):
+    # sesi login aktif (id = hash token, bukan token cookie-nya)
+    if session_store is None:
+        return []
+    return [{**row, "id": row["id"][:12]} for row in session_store.active()]
+
+
+@router.post("/sessions/revoke", name="admin_sessions_revoke")
+def sessions_revoke(user_id: int = Form(...), _: bool = Depends(require_admin)):
+    # logout paksa semua sesi milik user ini, di semua worker
+    if session_store is None:
+        raise HTTPException(400, "SESSION_BACKEND=cookie cannot revoke sessions")
+    return {"revoked": session_store.revoke_user(user_id)}
+
+
+# ---------- Job latar ----------
+@router.get("/jobs", response_class=HTMLResponse, name="admin_jobs")
+def jobs_list(
+    request: Request,
+    status: str = "",
+    cursor: str = "",
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    query = db.query(Job)
+    if status in JOB_STATUSES:
+        query = query.filter(Job.status == status)
+    else:
+        status = ""
+    items, next_cursor = keyset_page(
+        query, Job.created_at, Job.id, cursor, ADMIN_PAGE_SIZE
+    )
+    return templates.TemplateResponse(
+        "admin/jobs_list.html",
+        {
+            "request": request,
+            "items": items,
+            "counts": status_counts(db),
+            "status": status,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@router.post("/jobs/{id}/retry", name="admin_job_retry")
+def job_retry(
+    request: Request,
+    id: int,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    retry_job(db, id)
+    return RedirectResponse(
+        url=request.url_for("admin_jobs").include_query_params(status="failed"),
+        status_code=status.HTTP_303_SEE_OTHER,
+    )
+
+
 # ---------- Activities CRUD ----------
 @router.get("/activities", response_class=HTMLResponse, name="admin_activities")
 def activities_list(
-    request: Request, db: Session = Depends(get_db), _: bool = Depends(require_admin)
+    request: Request,
+    cursor: str = "",
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
 ):
-    items = db.query(Activity).order_by(Activity.date.desc()).all()
+    items, next_cursor = keyset_page(
+        db.query(Activity), Activity.date, Activity.id, cursor, ADMIN_PAGE_SIZE
+    )
     return templates.TemplateResponse(
-        "admin/activities_list.html", {"request": request, "items": items}
+        "admin/activities_list.html",
+        {
+            "request": request,
+            "items": items,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+        },
     )
 
 
@@ -96,6 +210,7 @@ def activity_create(
     )
     db.add(obj)
     db.commit()
+    page_cache.invalidate("activities")
     return RedirectResponse(
         url=request.url_for("admin_activities"), status_code=status.HTTP_303_SEE_OTHER
     )
@@ -152,6 +267,7 @@ def activity_update(
     obj.date = d
     obj.location = location.strip() or None
     db.commit()
+    page_cache.invalidate("activities")
     return RedirectResponse(
         url=request.url_for("admin_activities"), status_code=status.HTTP_303_SEE_OTHER
     )
@@ -168,6 +284,8 @@ def activity_delete(
     if obj:
         db.delete(obj)
         db.commit()
+        # tag kedua: feed .ics dibangun ulang karena baris ini sudah hilang
+        page_cache.invalidate("activities", DELETED_TAG)
     return RedirectResponse(
         url=request.url_for("admin_activities"), status_code=status.HTTP_303_SEE_OTHER
     )
@@ -176,11 +294,22 @@ def activity_delete(
 # ---------- News CRUD ----------
 @router.get("/news", response_class=HTMLResponse, name="admin_news")
 def news_list(
-    request: Request, db: Session = Depends(get_db), _: bool = Depends(require_admin)
+    request: Request,
+    cursor: str = "",
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
 ):
-    items = db.query(News).order_by(News.created_at.desc()).all()
+    items, next_cursor = keyset_page(
+        db.query(News), News.created_at, News.id, cursor, ADMIN_PAGE_SIZE
+    )
     return templates.TemplateResponse(
-        "admin/news_list.html", {"request": request, "items": items}
+        "admin/news_list.html",
+        {
+            "request": request,
+            "items": items,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+        },
     )
 
 
@@ -202,6 +331,7 @@ def news_create(
     obj = News(title=title.strip(), body=body.strip())
     db.add(obj)
     db.commit()
+    page_cache.invalidate("news")
     return RedirectResponse(
         url=request.url_for("admin_news"), status_code=status.HTTP_303_SEE_OTHER
     )
@@ -241,6 +371,7 @@ def news_update(
     obj.title = title.strip()
     obj.body = body.strip()
     db.commit()
+    page_cache.invalidate("news")
     return RedirectResponse(
         url=request.url_for("admin_news"), status_code=status.HTTP_303_SEE_OTHER
     )
@@ -257,6 +388,7 @@ def news_delete(
     if obj:
         db.delete(obj)
         db.commit()
+        page_cache.invalidate("news")
     return RedirectResponse(
         url=request.url_for("admin_news"), status_code=status.HTTP_303_SEE_OTHER
     )
@@ -265,14 +397,145 @@ def news_delete(
 # ---------- Members CRUD (basic) ----------
 @router.get("/members", response_class=HTMLResponse, name="admin_members")
 def members_list(
-    request: Request, db: Session = Depends(get_db), _: bool = Depends(require_admin)
+    request: Request,
+    q: str = "",
+    cursor: str = "",
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
 ):
-    items = db.query(Member).order_by(Member.created_at.desc()).all()
+    if q.strip():
+        items, next_cursor = search_page(db, q, cursor, ADMIN_PAGE_SIZE)
+    else:
+        items, next_cursor = keyset_page(
+            db.query(Member), Member.created_at, Member.id, cursor, ADMIN_PAGE_SIZE
+        )
     return templates.TemplateResponse(
-        "admin/members_list.html", {"request": request, "items": items}
+        "admin/members_list.html",
+        {
+            "request": request,
+            "items": items,
+            "q": q,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+        },
     )
 
 
+@router.get(
+    "/members/import", response_class=HTMLResponse, name="admin_members_import"
+)
+def members_import_form(request: Request, _: bool = Depends(require_admin)):
+    return templates.TemplateResponse(
+        "admin/members_import.html", {"request": request, "report": None}
+    )
+
+
+@router.post("/members/import", response_class=HTMLResponse)
+def members_import(
+    request: Request,
+    file: UploadFile = File(...),
+    on_duplicate: str = Form("skip"),
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    # def biasa -> berjalan di threadpool; file dibaca baris per baris
+    error, report = None, None
+    try:
+        report = import_members(
+            db, file.file, file.filename or "", update=on_duplicate == "update"
+        )
+    except ImportFormatError as e:
+        error = str(e)
+    return templates.TemplateResponse(
+        "admin/members_import.html",
+        {"request": request, "report": report, "error": error},
+    )
+
+
+@router.get("/members/export", name="admin_members_export")
+def members_export(format: str = "csv", _: bool = Depends(require_admin)):
+    stamp = datetime.now().strftime("%Y%m%d")
+    if format == "xlsx":
+        path = export_xlsx()
+        return FileResponse(
+            path,
+            filename=f"anggota-{stamp}.xlsx",
+            media_type=XLSX_MEDIA_TYPE,
+            background=BackgroundTask(os.remove, path),
+        )
+    return StreamingResponse(
+        export_csv(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="anggota-{stamp}.csv"'},
+    )
+
+
+def _cards_form(request: Request, form: dict, error: Optional[str] = None):
+    return templates.TemplateResponse(
+        "admin/member_cards.html",
+        {
+            "request": request,
+            "form": form,
+            "error": error,
+            "max_cards": settings.CARD_BATCH_MAX,
+        },
+        status_code=400 if error else 200,
+    )
+
+
+@router.get("/members/cards", response_class=HTMLResponse, name="admin_member_cards")
+def member_cards_form(request: Request, _: bool = Depends(require_admin)):
+    return _cards_form(request, {})
+
+
+@router.get("/members/cards/sheet", name="admin_member_cards_sheet")
+def member_cards_sheet(
+    request: Request,
+    ids: str = "",
+    joined_from: str = "",
+    joined_to: str = "",
+    membership_type: str = "",
+    format: str = "html",
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    form = dict(request.query_params)
+    try:
+        id_list = parse_ids(ids)
+        date_from = date.fromisoformat(joined_from) if joined_from else None
+        date_to = date.fromisoformat(joined_to) if joined_to else None
+    except ValueError:
+        return _cards_form(request, form, "ID atau tanggal tidak valid.")
+    limit = settings.CARD_BATCH_MAX
+    rows = card_rows(db, id_list, date_from, date_to, membership_type, limit + 1)
+    if not rows:
+        return _cards_form(request, form, "Tidak ada anggota yang cocok.")
+    if len(rows) > limit:
+        return _cards_form(
+            request, form, f"Lebih dari {limit} anggota cocok; persempit filter."
+        )
+
+    # hasil dikirim per halaman begitu selesai dirender di pool proses
+    stamp = datetime.now().strftime("%Y%m%d")
+    if format == "pdf":
+        return StreamingResponse(
+            pdf_stream(rows),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'inline; filename="kartu-anggota-{stamp}.pdf"'
+            },
+        )
+    photo_url = thumb_url(
+        str(request.url_for("photo_thumb", size=PHOTO_SIZE, fmt="jpg", path="")),
+        str(request.url_for("static", path="")),
+    )
+    stream = templates.env.get_template("admin/member_cards_sheet.html").stream(
+        request=request, total=len(rows), pages=html_pages(rows, photo_url)
+    )
+    stream.enable_buffering(CARDS_PER_PAGE * 20)
+    return StreamingResponse(stream, media_type="text/html; charset=utf-8")
+
+
 @router.get("/members/{id}/edit", response_class=HTMLResponse, name="admin_member_edit")
 def member_edit(
     request: Request,
@@ -302,17 +565,17 @@ async def member_update(
     occupation: str = Form(""),
     dob: str = Form(""),
     photo: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_admin),
 ):
-    obj = db.get(Member, id)
+    obj = await db.get(Member, id)
     if not obj:
         from fastapi import HTTPException
 
         raise HTTPException(404, "Not found")
 
     obj.name = name.strip()
-    obj.email = email.lower().strip()
+    obj.email = normalize_email(email)
     obj.phone = phone.strip()
     obj.membership_type = membership_type
     obj.address = address.strip() or None
@@ -325,15 +588,34 @@ async def member_update(
             pass
 
     if photo and photo.filename:
-        fname = secure_filename(photo.filename)
-        fname = f"{int(datetime.utcnow().timestamp())}_{fname}"
-        os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
-        save_path = os.path.join(settings.UPLOAD_FOLDER, fname)
-        with open(save_path, "wb") as f:
-            f.write(await photo.read())
-        obj.photo = f"static/img/uploads/{fname}"
+        error = None
+        if not allowed_file(photo.filename):
+            error = "Format foto tidak didukung (png/jpg/jpeg/gif/webp)."
+        else:
+            try:
+                obj.photo = await save_upload(photo)
+                enqueue(db, "thumbnails", photo=obj.photo)
+            except UploadTooLarge:
+                error = f"Ukuran foto maksimal {settings.MAX_CONTENT_LENGTH_MB} MB."
+        if error:
+            await db.rollback()
+            return templates.TemplateResponse(
+                "admin/members_form.html",
+                {"request": request, "item": await db.get(Member, id), "error": error},
+            )
 
-    db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return templates.TemplateResponse(
+            "admin/members_form.html",
+            {
+                "request": request,
+                "item": await db.get(Member, id),
+                "error": "Email sudah dipakai anggota lain.",
+            },
+        )
     return RedirectResponse(
         url=request.url_for("admin_members"), status_code=status.HTTP_303_SEE_OTHER
     )
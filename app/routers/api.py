@@ -0,0 +1,142 @@
+import hashlib
+import json
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.activity import Activity
+from app.models.member import Member
+from app.models.news import News
+from app.pagination import keyset_page
+from app.schemas.activity import ActivityOut
+from app.schemas.member import MemberOut
+from app.schemas.news import NewsOut
+
+try:
+    import orjson
+except ImportError:  # orjson opsional: tanpa itu pakai json bawaan
+    orjson = None
+
+router = APIRouter(prefix="/api/v1", tags=["api"])
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_default, separators=(",", ":")).encode()
+
+
+def _fields(schema, fields: str) -> list[str]:
+    """``?fields=id,name`` -> daftar kolom; kosong = semua field schema."""
+    allowed = list(schema.model_fields)
+    if not fields.strip():
+        return allowed
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in allowed]
+    if unknown:
+        raise HTTPException(400, f"unknown fields: {', '.join(unknown)}")
+    return wanted
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _list_response(request: Request, db: Session, model, schema, cursor, limit, fields):
+    """Halaman keyset (created_at desc) sebagai JSON.
+
+    Baris diambil sebagai tuple kolom dan langsung di-serialize tanpa membuat
+    objek ORM maupun validasi Pydantic per baris; tipe kolom model sudah
+    sesuai schema ``*Out``.
+    """
+    names = _fields(schema, fields)
+    # created_at & id selalu diambil untuk cursor halaman berikutnya
+    columns = list(dict.fromkeys([*names, "created_at", "id"]))
+    query = db.query(*[getattr(model, name) for name in columns])
+    rows, next_cursor = keyset_page(
+        query, model.created_at, model.id, cursor, min(max(limit, 1), MAX_LIMIT)
+    )
+    body = dumps(
+        {
+            "items": [{name: getattr(row, name) for name in names} for row in rows],
+            "next_cursor": next_cursor,
+        }
+    )
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _get_or_404(db: Session, model, id: int):
+    obj = db.get(model, id)
+    if not obj:
+        raise HTTPException(404, "Not found")
+    return obj
+
+
+# ---------- members ----------
+@router.get("/members", name="api_members")
+def members(
+    request: Request,
+    cursor: str = "",
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: str = "",
+    db: Session = Depends(get_db),
+):
+    return _list_response(request, db, Member, MemberOut, cursor, limit, fields)
+
+
+@router.get("/members/{id}", response_model=MemberOut, name="api_member")
+def member(id: int, db: Session = Depends(get_db)):
+    return _get_or_404(db, Member, id)
+
+
+# ---------- news ----------
+@router.get("/news", name="api_news")
+def news(
+    request: Request,
+    cursor: str = "",
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: str = "",
+    db: Session = Depends(get_db),
+):
+    return _list_response(request, db, News, NewsOut, cursor, limit, fields)
+
+
+@router.get("/news/{id}", response_model=NewsOut, name="api_news_item")
+def news_item(id: int, db: Session = Depends(get_db)):
+    return _get_or_404(db, News, id)
+
+
+# ---------- activities ----------
+@router.get("/activities", name="api_activities")
+def activities(
+    request: Request,
+    cursor: str = "",
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: str = "",
+    db: Session = Depends(get_db),
+):
+    return _list_response(request, db, Activity, ActivityOut, cursor, limit, fields)
+
+
+@router.get("/activities/{id}", response_model=ActivityOut, name="api_activity")
+def activity(id: int, db: Session = Depends(get_db)):
+    return _get_or_404(db, Activity, id)
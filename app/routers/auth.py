@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Request, Depends, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from app.templating import templates
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.user import User
-from app.auth import hash_password, verify_password
+from app.auth import (
+    HashingBusy,
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 
 from app.config import settings
 import os
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(tags=["auth"])
 
 
@@ -47,18 +54,36 @@ def login_form(request: Request):
 
 
 @router.post("/login", response_class=HTMLResponse)
-def login_submit(
+async def login_submit(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.password_hash):
+    user = await db.scalar(select(User).where(User.username == username))
+    try:
+        ok = await verify_password_async(
+            password, user.password_hash if user else None
+        )
+    except HashingBusy:
+        return templates.TemplateResponse(
+            "auth/login.html",
+            {"request": request, "error": "Server sedang sibuk. Coba lagi sebentar."},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "2"},
+        )
+    if not ok:
         return templates.TemplateResponse(
             "auth/login.html",
             {"request": request, "error": "Username atau password salah."},
         )
+    if needs_rehash(user.password_hash):
+        # parameter hash berubah di Settings -> perbarui selagi password diketahui
+        try:
+            user.password_hash = await hash_password_async(password)
+            await db.commit()
+        except HashingBusy:
+            pass
     request.session["user"] = {
         "id": user.id,
         "username": user.username,
@@ -1,41 +1,166 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import HTMLResponse
+import calendar
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy.orm import Session
+from app.cache import cached_page
+from app.conditional import conditional_get, http_date, is_not_modified
 from app.database import get_db
+from app.ical import activity_feed
 from app.models.activity import Activity
 from app.models.news import News
-from fastapi.templating import Jinja2Templates
+from app.pagination import keyset_page
+from app.templating import templates
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter()
 
+PAGE_SIZE = 12
+MONTHS = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember",
+]  # fmt: skip
+WEEKDAYS = ["Sen", "Sel", "Rab", "Kam", "Jum", "Sab", "Min"]
+# tahun yang bisa dibuka di kalender; di luar ini 404 (date.min/max meluap)
+CALENDAR_YEARS = range(1900, 2101)
+
 
 @router.get("/", response_class=HTMLResponse, name="home")
+@cached_page("news", "activities")
 def home(request: Request, db: Session = Depends(get_db)):
     latest_news = db.query(News).order_by(News.created_at.desc()).limit(3).all()
-    upcoming = db.query(Activity).order_by(Activity.date.asc()).limit(3).all()
+    # yang akan datang saja: range date >= hari ini pada indeks (date, id)
+    upcoming = (
+        db.query(Activity)
+        .filter(Activity.date >= date.today())
+        .order_by(Activity.date.asc(), Activity.id.asc())
+        .limit(3)
+        .all()
+    )
     return templates.TemplateResponse(
         "index.html", {"request": request, "news": latest_news, "activities": upcoming}
     )
 
 
 @router.get("/activities", response_class=HTMLResponse, name="activities")
-def activities_page(request: Request, db: Session = Depends(get_db)):
-    items = db.query(Activity).order_by(Activity.date.desc()).all()
+@cached_page("activities")
+def activities_page(
+    request: Request,
+    when: str = Query("upcoming"),
+    cursor: str = Query(""),
+    db: Session = Depends(get_db),
+):
+    # akan datang: naik dari hari ini; sudah lewat: turun dari kemarin
+    past = when == "past"
+    today = date.today()
+    query = db.query(Activity).filter(
+        Activity.date < today if past else Activity.date >= today
+    )
+    items, next_cursor = keyset_page(
+        query, Activity.date, Activity.id, cursor, PAGE_SIZE, descending=past
+    )
     return templates.TemplateResponse(
-        "activities.html", {"request": request, "activities": items}
+        "activities.html",
+        {
+            "request": request,
+            "activities": items,
+            "when": "past" if past else "upcoming",
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@router.get(
+    "/activities/calendar", response_class=HTMLResponse, name="activities_calendar"
+)
+@cached_page("activities")
+def activities_calendar(
+    request: Request, month: str = Query(""), db: Session = Depends(get_db)
+):
+    try:
+        first = datetime.strptime(month, "%Y-%m").date() if month else date.today()
+    except ValueError:
+        raise HTTPException(404, "Not found")
+    if first.year not in CALENDAR_YEARS:
+        raise HTTPException(404, "Not found")
+    first = first.replace(day=1)
+    # tombol navigasi disembunyikan di batas CALENDAR_YEARS
+    prev_month, next_month = (
+        day.strftime("%Y-%m") if day.year in CALENDAR_YEARS else None
+        for day in (first - timedelta(days=1), first + timedelta(days=31))
+    )
+    # grid Senin-Minggu, termasuk hari dari bulan sebelum/sesudahnya
+    weeks = calendar.Calendar().monthdatescalendar(first.year, first.month)
+    rows = (
+        db.query(Activity)
+        .filter(Activity.date >= weeks[0][0], Activity.date <= weeks[-1][-1])
+        .order_by(Activity.date.asc(), Activity.id.asc())
+        .all()
+    )
+    by_day = defaultdict(list)
+    for a in rows:
+        by_day[a.date].append(a)
+    return templates.TemplateResponse(
+        "activities_calendar.html",
+        {
+            "request": request,
+            "title": f"{MONTHS[first.month - 1]} {first.year}",
+            "month": first,
+            "weeks": weeks,
+            "weekdays": WEEKDAYS,
+            "by_day": by_day,
+            "today": date.today(),
+            "prev_month": prev_month,
+            "next_month": next_month,
+        },
+    )
+
+
+@router.get("/activities.ics", name="activities_ics")
+def activities_ics(request: Request, db: Session = Depends(get_db)):
+    # feed langganan kalender; dilayani dari memori, DB hanya setelah CRUD
+    body, etag, last_modified = activity_feed.get(db)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        body,
+        media_type="text/calendar; charset=utf-8",
+        headers={
+            **headers,
+            "Content-Disposition": 'inline; filename="kegiatan.ics"',
+        },
     )
 
 
 @router.get("/news", response_class=HTMLResponse, name="news")
-def news_page(request: Request, db: Session = Depends(get_db)):
-    items = db.query(News).order_by(News.created_at.desc()).all()
-    return templates.TemplateResponse("news.html", {"request": request, "news": items})
+@cached_page("news")
+def news_page(request: Request, cursor: str = Query(""), db: Session = Depends(get_db)):
+    items, next_cursor = keyset_page(
+        db.query(News), News.created_at, News.id, cursor, PAGE_SIZE
+    )
+    return templates.TemplateResponse(
+        "news.html",
+        {
+            "request": request,
+            "news": items,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+        },
+    )
 
 
 @router.get(
     "/activities/{activity_id}", response_class=HTMLResponse, name="activity_detail"
 )
+@conditional_get(Activity, "activity_id")
+@cached_page("activities")
 def activity_detail(request: Request, activity_id: int, db: Session = Depends(get_db)):
     item = db.get(Activity, activity_id)
     if not item:
@@ -46,6 +171,8 @@ def activity_detail(request: Request, activity_id: int, db: Session = Depends(ge
 
 
 @router.get("/news/{news_id}", response_class=HTMLResponse, name="news_detail")
+@conditional_get(News, "news_id")
+@cached_page("news")
 def news_detail(request: Request, news_id: int, db: Session = Depends(get_db)):
     item = db.get(News, news_id)
     if not item:
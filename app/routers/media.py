@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse
+from app.thumbnails import FORMATS, SIZES, generate, source_rel
+from app.uploads import UPLOAD_URL_PREFIX
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+
+@router.get("/thumb/{size}/{fmt}/{path:path}", name="photo_thumb")
+def photo_thumb(request: Request, size: str, fmt: str, path: str):
+    # turunan dibuat saat pertama diminta (foto lama), lalu disajikan dari disk
+    rel = source_rel(f"{UPLOAD_URL_PREFIX}/{path}")
+    if rel is None or size not in SIZES or fmt not in FORMATS:
+        raise HTTPException(404, "Not found")
+    dest = generate(rel, size, fmt)
+    if dest is None:
+        # Pillow tidak tersedia / foto tidak bisa dibaca -> pakai foto asli
+        return RedirectResponse(request.url_for("static", path=f"img/uploads/{path}"))
+    return FileResponse(
+        dest,
+        media_type="image/webp" if fmt == "webp" else "image/jpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
@@ -1,29 +1,57 @@
 from fastapi import APIRouter, Request, Depends, Query, HTTPException
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
+from app.conditional import conditional_get
 from app.database import get_db
 from app.models.member import Member
-from fastapi.templating import Jinja2Templates
+from app.pagination import keyset_page
+from app.search import search_page
+from app.templating import templates
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(prefix="/members", tags=["members"])
 
+PAGE_SIZE = 24
+
+
+def _member_page(db: Session, q: str, cursor: str):
+    if not q:
+        query = db.query(Member)
+        return keyset_page(query, Member.created_at, Member.id, cursor, PAGE_SIZE)
+    # hasil pencarian urut relevansi
+    return search_page(db, q, cursor, PAGE_SIZE)
+
 
 @router.get("", response_class=HTMLResponse, name="members")
 def list_members(
-    request: Request, q: str = Query("", alias="q"), db: Session = Depends(get_db)
+    request: Request,
+    q: str = Query("", alias="q"),
+    cursor: str = Query(""),
+    db: Session = Depends(get_db),
+):
+    items, next_cursor = _member_page(db, q, cursor)
+    return templates.TemplateResponse(
+        "member_list.html",
+        {"request": request, "members": items, "q": q, "next_cursor": next_cursor},
+    )
+
+
+@router.get("/fragment", response_class=HTMLResponse, name="members_fragment")
+def list_members_fragment(
+    request: Request,
+    q: str = Query("", alias="q"),
+    cursor: str = Query(""),
+    db: Session = Depends(get_db),
 ):
-    query = db.query(Member)
-    if q:
-        like = f"%{q.lower()}%"
-        query = query.filter(Member.name.ilike(like))
-    items = query.order_by(Member.created_at.desc()).all()
+    # hanya kartu batch berikutnya (untuk infinite scroll)
+    items, next_cursor = _member_page(db, q, cursor)
     return templates.TemplateResponse(
-        "member_list.html", {"request": request, "members": items, "q": q}
+        "member_cards.html",
+        {"request": request, "members": items, "q": q, "next_cursor": next_cursor},
     )
 
 
 @router.get("/{member_id}", response_class=HTMLResponse, name="member_detail")
+@conditional_get(Member, "member_id")
 def member_detail(request: Request, member_id: int, db: Session = Depends(get_db)):
     m = db.get(Member, member_id)
     if not m:
@@ -1,24 +1,21 @@
 from datetime import datetime
-import os
 from fastapi import APIRouter, Request, Depends, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from starlette import status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import SessionLocal, get_async_db, get_db
+from app.email_filter import email_filter, normalize_email
+from app.jobs import enqueue
 from app.models.member import Member
 from app.config import settings
-from fastapi.templating import Jinja2Templates
-from werkzeug.utils import secure_filename
+from app.uploads import UploadTooLarge, allowed_file, save_upload
+from app.templating import templates
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(tags=["register"])
 
-ALLOWED_EXT = {"png", "jpg", "jpeg", "gif", "webp"}
-
-
-def allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXT
-
 
 @router.get("/register", response_class=HTMLResponse, name="register")
 def register_form(request: Request):
@@ -27,6 +24,23 @@ def register_form(request: Request):
     )
 
 
+@router.get("/register/email-available", name="register_email_available")
+def email_available(email: str = "", db: Session = Depends(get_db)):
+    """Validasi langsung di form pendaftaran (lihat static/js/main.js)."""
+    email = normalize_email(email)
+    available = bool(email) and not email_filter.is_taken(db, email)
+    return JSONResponse(
+        {"email": email, "available": available},
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+def _email_taken(email: str) -> bool:
+    # di threadpool: sinkron filter bisa menunggu lock atau membangun ulang
+    with SessionLocal() as db:
+        return email_filter.is_taken(db, email)
+
+
 @router.post("/register", response_class=HTMLResponse, name="register_submit")
 async def register_submit(
     request: Request,
@@ -38,7 +52,7 @@ async def register_submit(
     occupation: str = Form(""),
     membership_type: str = Form("Reguler"),
     photo: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     errors = {}
     form_data = {
@@ -58,17 +72,8 @@ async def register_submit(
         errors["phone"] = "No. HP wajib diisi."
 
     photo_path = None
-    if photo and photo.filename:
-        if not allowed_file(photo.filename):
-            errors["photo"] = "Format foto tidak didukung (png/jpg/jpeg/gif/webp)."
-        else:
-            fname = secure_filename(photo.filename)
-            fname = f"{int(datetime.utcnow().timestamp())}_{fname}"
-            os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
-            save_path = os.path.join(settings.UPLOAD_FOLDER, fname)
-            with open(save_path, "wb") as f:
-                f.write(await photo.read())
-            photo_path = f"static/img/uploads/{fname}"
+    if photo and photo.filename and not allowed_file(photo.filename):
+        errors["photo"] = "Format foto tidak didukung (png/jpg/jpeg/gif/webp)."
 
     from datetime import date as _date
 
@@ -79,6 +84,18 @@ async def register_submit(
         except Exception:
             errors["dob"] = "Format tanggal lahir harus YYYY-MM-DD."
 
+    # email terpakai ditolak sebelum foto disimpan & diproses
+    if not errors and await run_in_threadpool(_email_taken, email):
+        errors["email"] = "Email sudah terdaftar."
+
+    if not errors and photo and photo.filename:
+        try:
+            photo_path = await save_upload(photo)
+        except UploadTooLarge:
+            errors["photo"] = (
+                f"Ukuran foto maksimal {settings.MAX_CONTENT_LENGTH_MB} MB."
+            )
+
     if errors:
         return templates.TemplateResponse(
             "register.html", {"request": request, "errors": errors, "form": form_data}
@@ -86,7 +103,7 @@ async def register_submit(
 
     m = Member(
         name=name.strip(),
-        email=email.lower().strip(),
+        email=normalize_email(email),
         phone=phone.strip(),
         address=address.strip() if address else None,
         dob=dob_date,
@@ -97,11 +114,15 @@ async def register_submit(
 
     try:
         db.add(m)
-        db.commit()
-        db.refresh(m)
+        if photo_path:
+            # thumbnail dibuat worker latar; /media/thumb membuatnya sendiri
+            # bila halaman dibuka sebelum job selesai
+            enqueue(db, "thumbnails", photo=photo_path)
+        await db.commit()
     except Exception as e:
-        db.rollback()
-        if "UNIQUE" in str(e).upper():
+        await db.rollback()
+        # unique index tetap penentu bila dua pendaftaran berebut email yang sama
+        if isinstance(e, IntegrityError):
             errors["email"] = "Email sudah terdaftar."
         else:
             errors["general"] = "Terjadi kesalahan. Coba lagi."
@@ -0,0 +1,94 @@
+import fcntl
+import logging
+import os
+from datetime import datetime
+
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.conditional import ensure_updated_at
+from app.config import settings
+from app.database import Base
+from app.models.activity import Activity
+from app.models.job import Job  # noqa: F401  (tabel jobs)
+from app.models.member import Member
+from app.models.news import News
+from app.models.schema_version import SchemaVersion
+from app.models.session import ServerSession  # noqa: F401  (tabel sessions)
+from app.models.stats import StatCounter  # noqa: F401
+from app.models.user import User  # noqa: F401
+from app.search import ensure_fulltext_index
+from app.stats import ensure_rollups
+
+# naikkan setiap ada perubahan model (tabel, kolom, indeks) agar worker
+# berikutnya menjalankan migrate() sekali
+SCHEMA_VERSION = 4
+
+log = logging.getLogger(__name__)
+
+
+def current_version(engine) -> int | None:
+    """Satu query; None bila tabel ``schema_version`` belum ada."""
+    try:
+        with engine.connect() as conn:
+            return conn.scalar(
+                select(SchemaVersion.version).where(SchemaVersion.id == 1)
+            )
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def _create_missing_indexes(engine):
+    # create_all tidak menambah indeks ke tabel yang sudah ada
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+
+
+def migrate(engine):
+    Base.metadata.create_all(bind=engine)
+    ensure_updated_at(engine, [Member, News, Activity])
+    _create_missing_indexes(engine)
+    ensure_fulltext_index(engine)
+    with Session(engine) as db:
+        ensure_rollups(db)
+        row = db.get(SchemaVersion, 1)
+        if row is None:
+            db.add(SchemaVersion(id=1, version=SCHEMA_VERSION))
+        else:
+            row.version = SCHEMA_VERSION
+            row.applied_at = datetime.utcnow()
+        db.commit()
+
+
+def ensure_schema(engine) -> bool:
+    """Dipanggil saat worker start: migrate() hanya bila versi berbeda.
+
+    Worker Passenger yang start bersamaan antre di file lock, lalu cek ulang
+    versinya, sehingga migrasi dijalankan satu worker saja.
+    """
+    if current_version(engine) == SCHEMA_VERSION:
+        return False
+    os.makedirs(settings.CACHE_DIR, exist_ok=True)
+    with open(os.path.join(settings.CACHE_DIR, "schema.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            version = current_version(engine)
+            if version == SCHEMA_VERSION:
+                return False
+            log.info("migrating schema %s -> %s", version, SCHEMA_VERSION)
+            migrate(engine)
+            return True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+if __name__ == "__main__":
+    # python -m app.schema  -> jalankan migrasi saat deploy (tanpa menunggu worker)
+    from app.database import engine
+
+    print("migrated" if ensure_schema(engine) else "schema up to date")
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Optional
+
+class ActivityOut(BaseModel):
+    id: int
+    title: str
+    description: str
+    date: date
+    location: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
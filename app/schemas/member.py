@@ -1,15 +1,19 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date, datetime
-from typing import Optional
+from typing import Literal, Optional
 
+MembershipType = Literal["Reguler", "Premium", "Pelajar"]
+
+# batas panjang mengikuti kolom app/models/member.py, agar baris import yang
+# terlalu panjang dilaporkan per baris, bukan gagal di INSERT (MySQL strict)
 class MemberCreate(BaseModel):
-    name: str
-    email: EmailStr
-    phone: str
+    name: str = Field(max_length=120)
+    email: EmailStr = Field(max_length=120)
+    phone: str = Field(max_length=32)
     address: Optional[str] = None
     dob: Optional[date] = None
-    occupation: Optional[str] = None
-    membership_type: str = "Reguler"
+    occupation: Optional[str] = Field(None, max_length=120)
+    membership_type: MembershipType = "Reguler"
 
 class MemberOut(BaseModel):
     id: int
@@ -22,6 +26,7 @@ class MemberOut(BaseModel):
     membership_type: str
     photo: Optional[str] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
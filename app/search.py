@@ -0,0 +1,247 @@
+import logging
+import math
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from sqlalchemy import DDL, event, select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, on_commit, pending
+from app.models.member import Member
+
+log = logging.getLogger(__name__)
+
+# bobot kolom saat perankingan
+FIELD_WEIGHTS = {"name": 3, "occupation": 1, "email": 1}
+# minimal porsi trigram query yang harus cocok agar dianggap hasil
+MIN_MATCH_RATIO = 0.6
+
+FULLTEXT_INDEX = "ft_members_search"
+
+# MySQL: FULLTEXT ngram (cocok untuk potongan nama, bukan hanya kata utuh)
+event.listen(
+    Member.__table__,
+    "after_create",
+    DDL(
+        f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON members (name, occupation, email) "
+        "WITH PARSER ngram"
+    ).execute_if(dialect="mysql"),
+)
+
+
+def normalize(value: str | None) -> str:
+    """Huruf kecil, tanpa diakritik, spasi dirapikan ("Sétiawan" -> "setiawan")."""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.casefold().split())
+
+
+def trigrams(value: str) -> set[str]:
+    grams = set()
+    for word in value.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Indeks trigram in-process untuk pencarian anggota (fallback non-MySQL).
+
+    Posting list ``trigram -> {id}`` membuat pencarian hanya menyentuh dokumen
+    yang berbagi trigram dengan query, bukan seluruh tabel. Perubahan dari
+    proses worker lain tertangkap lewat rebuild berkala (``SEARCH_INDEX_TTL``)
+    di thread latar; selama itu pencarian memakai posting list lama.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # satu pembangunan indeks per worker pada satu waktu
+        self._build_lock = threading.Lock()
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._docs: dict[int, set[str]] = {}
+        self._loaded_at = 0.0
+
+    def _stale(self) -> bool:
+        return (
+            not self._loaded_at
+            or time.monotonic() - self._loaded_at > settings.SEARCH_INDEX_TTL
+        )
+
+    def load(self, db: Session):
+        rows = db.execute(
+            select(Member.id, Member.name, Member.occupation, Member.email)
+        ).all()
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._docs = {}
+            for row in rows:
+                self._add(row.id, row.name, row.occupation, row.email)
+            self._loaded_at = time.monotonic()
+
+    def _add(self, id: int, name, occupation, email):
+        fields = {"name": name, "occupation": occupation, "email": email}
+        weights: dict[str, int] = {}
+        for field, value in fields.items():
+            for gram in trigrams(normalize(value)):
+                weights[gram] = max(weights.get(gram, 0), FIELD_WEIGHTS[field])
+        for gram, weight in weights.items():
+            self._postings[gram][id] = weight
+        self._docs[id] = set(weights)
+
+    def upsert(self, id: int, name, occupation, email):
+        with self._lock:
+            if not self._loaded_at:
+                return
+            self._remove(id)
+            self._add(id, name, occupation, email)
+
+    def remove(self, id: int):
+        with self._lock:
+            self._remove(id)
+
+    def _remove(self, id: int):
+        for gram in self._docs.pop(id, ()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.pop(id, None)
+                if not posting:
+                    del self._postings[gram]
+
+    def _rebuild(self):
+        try:
+            with SessionLocal() as db:
+                self.load(db)
+        except Exception as e:
+            # indeks lama tetap dipakai; dicoba lagi pada pencarian berikutnya
+            log.warning("search index rebuild failed: %s", e)
+        finally:
+            self._build_lock.release()
+
+    def _ensure_loaded(self, db: Session):
+        if not self._loaded_at:
+            # belum ada indeks sama sekali: request pertama menunggu satu load
+            with self._build_lock:
+                if not self._loaded_at:
+                    self.load(db)
+        elif self._stale() and self._build_lock.acquire(blocking=False):
+            threading.Thread(target=self._rebuild, daemon=True).start()
+
+    def search(self, db: Session, q: str, limit: int) -> list[int]:
+        self._ensure_loaded(db)
+        grams = trigrams(normalize(q))
+        if not grams:
+            return []
+        need = max(1, math.ceil(len(grams) * MIN_MATCH_RATIO))
+        hits: dict[int, int] = defaultdict(int)
+        scores: dict[int, int] = defaultdict(int)
+        with self._lock:
+            for gram in grams:
+                for id, weight in self._postings.get(gram, {}).items():
+                    hits[id] += 1
+                    scores[id] += weight
+        ranked = [id for id, n in hits.items() if n >= need]
+        ranked.sort(key=lambda id: (-scores[id], -id))
+        return ranked[:limit]
+
+
+member_index = TrigramIndex()
+
+
+def _mysql_search(db: Session, q: str, limit: int) -> list[int]:
+    match = "MATCH (name, occupation, email) AGAINST (:q IN NATURAL LANGUAGE MODE)"
+    rows = db.execute(
+        text(
+            f"SELECT id FROM members WHERE {match} "
+            f"ORDER BY {match} DESC, id DESC LIMIT :limit"
+        ),
+        {"q": q, "limit": limit},
+    ).all()
+    return [row.id for row in rows]
+
+
+def search_member_ids(db: Session, q: str, limit: int) -> list[int]:
+    """ID anggota yang cocok dengan ``q`` (nama/pekerjaan/email), urut relevansi."""
+    q = normalize(q)
+    if not q:
+        return []
+    if db.get_bind().dialect.name == "mysql":
+        try:
+            return _mysql_search(db, q, limit)
+        except Exception as e:
+            # indeks FULLTEXT belum ada -> pakai indeks in-process
+            log.warning("fulltext search unavailable, using trigram index: %s", e)
+            db.rollback()
+    return member_index.search(db, q, limit)
+
+
+def search_page(
+    db: Session, q: str, cursor: str, size: int
+) -> tuple[list[Member], str | None]:
+    """Satu halaman hasil pencarian; cursor = posisi dalam daftar peringkat.
+
+    Berbeda dengan cursor keyset ``app/pagination.py``, cursor di sini adalah
+    offset (string angka): urutan relevansi tidak punya kolom untuk keyset.
+    Akibatnya halaman bisa bergeser bila anggota ditambah/dihapus di antara
+    dua request. Hanya ``start + size + 1`` ID teratas yang diambil, jadi
+    seluruh hasil tetap bisa dijelajahi halaman demi halaman.
+    """
+    start = int(cursor) if cursor.isdecimal() and len(cursor) < 10 else 0
+    ids = search_member_ids(db, q, start + size + 1)
+    page_ids = ids[start : start + size]
+    rows = {m.id: m for m in db.query(Member).filter(Member.id.in_(page_ids))}
+    items = [rows[id] for id in page_ids if id in rows]
+    next_cursor = str(start + size) if len(ids) > start + size else None
+    return items, next_cursor
+
+
+def ensure_fulltext_index(engine):
+    """Buat indeks FULLTEXT di MySQL untuk tabel ``members`` yang sudah ada."""
+    if engine.dialect.name != "mysql":
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'members' "
+                "AND index_name = :name LIMIT 1"
+            ),
+            {"name": FULLTEXT_INDEX},
+        ).first()
+        if not exists:
+            conn.execute(
+                text(
+                    f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} "
+                    "ON members (name, occupation, email) WITH PARSER ngram"
+                )
+            )
+
+
+# ---------- sinkronisasi indeks in-process setelah commit ----------
+# id -> (name, occupation, email), atau None bila dihapus
+@event.listens_for(Member, "after_insert")
+@event.listens_for(Member, "after_update")
+def _member_saved(mapper, connection, target):
+    pending(target, "search", dict)[target.id] = (
+        target.name,
+        target.occupation,
+        target.email,
+    )
+
+
+@event.listens_for(Member, "after_delete")
+def _member_deleted(mapper, connection, target):
+    pending(target, "search", dict)[target.id] = None
+
+
+@on_commit("search")
+def _apply_index_changes(changes: dict):
+    for id, fields in changes.items():
+        if fields is None:
+            member_index.remove(id)
+        else:
+            member_index.upsert(id, *fields)
@@ -0,0 +1,86 @@
+"""Isi data awal (sekali, saat instalasi/deploy), bukan di setiap worker start.
+
+  python -m app.seed            # admin + contoh berita/kegiatan
+  python -m app.seed --no-demo  # hanya admin
+"""
+
+import argparse
+import os
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.auth import hash_password
+from app.models.activity import Activity
+from app.models.news import News
+from app.models.user import User
+
+
+def seed_demo(db: Session) -> bool:
+    added = False
+    if not db.query(Activity.id).first():
+        db.add_all(
+            [
+                Activity(
+                    title="Rapat Anggota Tahunan",
+                    description="Pembahasan laporan keuangan dan program kerja.",
+                    date=date(2025, 3, 15),
+                    location="Aula Koperasi",
+                ),
+                Activity(
+                    title="Pelatihan UMKM",
+                    description="Workshop pemasaran digital untuk anggota.",
+                    date=date(2025, 5, 20),
+                    location="Ruang Pelatihan",
+                ),
+            ]
+        )
+        added = True
+    if not db.query(News.id).first():
+        db.add_all(
+            [
+                News(
+                    title="Koperasi Luncurkan Program Simpanan Berjangka",
+                    body="Program baru dengan bunga kompetitif untuk anggota.",
+                ),
+                News(
+                    title="Kerja Sama dengan Bank Lokal",
+                    body="Mempermudah akses modal bagi anggota UMKM.",
+                ),
+            ]
+        )
+        added = True
+    db.commit()
+    return added
+
+
+def ensure_admin(db: Session, username: str, password: str) -> bool:
+    if db.query(User.id).filter(User.username == username).first():
+        return False
+    db.add(User(username=username, password_hash=hash_password(password), role="admin"))
+    db.commit()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.seed")
+    parser.add_argument("--no-demo", action="store_true", help="tanpa contoh data")
+    parser.add_argument("--username", default=os.environ.get("ADMIN_USER", "admin"))
+    parser.add_argument(
+        "--password", default=os.environ.get("ADMIN_PASS", "admin123")
+    )
+    args = parser.parse_args(argv)
+
+    from app.database import engine
+    from app.schema import ensure_schema
+
+    ensure_schema(engine)
+    with Session(engine) as db:
+        if not args.no_demo:
+            print("demo data added" if seed_demo(db) else "demo data exists")
+        created = ensure_admin(db, args.username, args.password)
+        print(f"admin {args.username!r} {'created' if created else 'exists'}")
+
+
+if __name__ == "__main__":
+    main()
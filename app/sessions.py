@@ -0,0 +1,434 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import anyio
+from sqlalchemy import bindparam, delete, select, update
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from app.config import settings
+from app.database import engine
+from app.models.session import ServerSession
+
+log = logging.getLogger(__name__)
+
+COOKIE_NAME = "sid"
+# baris maksimum untuk daftar sesi aktif di /admin/sessions
+ACTIVE_LIMIT = 500
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# ---------- backend ----------
+class SessionBackend(ABC):
+    """Penyimpanan sesi; semua method blocking (dipanggil dari thread)."""
+
+    @abstractmethod
+    def load(self, key: str) -> dict | None: ...
+
+    @abstractmethod
+    def save(self, key: str, data: dict, expires_at: datetime): ...
+
+    @abstractmethod
+    def delete(self, key: str): ...
+
+    @abstractmethod
+    def delete_user(self, user_id: int) -> list[str]: ...
+
+    @abstractmethod
+    def touch(self, seen: dict[str, datetime]): ...
+
+    @abstractmethod
+    def active(self) -> list[dict]: ...
+
+
+class DatabaseSessionBackend(SessionBackend):
+    """Tabel ``sessions`` di database aplikasi (SQLite/MySQL)."""
+
+    table = ServerSession.__table__
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def load(self, key):
+        with self.engine.connect() as conn:
+            data = conn.scalar(
+                select(self.table.c.data).where(
+                    self.table.c.id == key,
+                    self.table.c.expires_at > datetime.utcnow(),
+                )
+            )
+        return json.loads(data) if data is not None else None
+
+    def save(self, key, data, expires_at):
+        now = datetime.utcnow()
+        values = {
+            "data": json.dumps(data),
+            "user_id": (data.get("user") or {}).get("id"),
+            "last_seen": now,
+            "expires_at": expires_at,
+        }
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(self.table).where(self.table.c.id == key).values(**values)
+            )
+            if result.rowcount == 0:
+                conn.execute(
+                    self.table.insert().values(id=key, created_at=now, **values)
+                )
+
+    def delete(self, key):
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.id == key))
+
+    def delete_user(self, user_id):
+        with self.engine.begin() as conn:
+            keys = list(
+                conn.scalars(
+                    select(self.table.c.id).where(self.table.c.user_id == user_id)
+                )
+            )
+            if keys:
+                conn.execute(delete(self.table).where(self.table.c.id.in_(keys)))
+        return keys
+
+    def touch(self, seen):
+        now = datetime.utcnow()
+        max_age = timedelta(seconds=settings.SESSION_MAX_AGE)
+        with self.engine.begin() as conn:
+            if seen:
+                conn.execute(
+                    update(self.table)
+                    .where(self.table.c.id == bindparam("key"))
+                    .values(last_seen=bindparam("seen"), expires_at=bindparam("exp")),
+                    [
+                        {"key": key, "seen": at, "exp": at + max_age}
+                        for key, at in seen.items()
+                    ],
+                )
+            # sekalian buang sesi kedaluwarsa (expires_at ber-index)
+            conn.execute(delete(self.table).where(self.table.c.expires_at < now))
+
+    def active(self):
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    self.table.c.id,
+                    self.table.c.user_id,
+                    self.table.c.created_at,
+                    self.table.c.last_seen,
+                    self.table.c.expires_at,
+                )
+                # expires_at = last_seen + SESSION_MAX_AGE, dan sudah ber-index
+                .where(self.table.c.expires_at > datetime.utcnow())
+                .order_by(self.table.c.expires_at.desc())
+                .limit(ACTIVE_LIMIT)
+            )
+            return [dict(row._mapping) for row in rows]
+
+
+class MemorySessionBackend(SessionBackend):
+    """Hanya untuk satu proses (development); hilang saat restart."""
+
+    def __init__(self):
+        self._rows: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        with self._lock:
+            row = self._rows.get(key)
+        if row is None or row["expires_at"] <= datetime.utcnow():
+            return None
+        return json.loads(row["data"])
+
+    def save(self, key, data, expires_at):
+        now = datetime.utcnow()
+        with self._lock:
+            row = self._rows.setdefault(key, {"id": key, "created_at": now})
+            row.update(
+                data=json.dumps(data),
+                user_id=(data.get("user") or {}).get("id"),
+                last_seen=now,
+                expires_at=expires_at,
+            )
+
+    def delete(self, key):
+        with self._lock:
+            self._rows.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            keys = [k for k, row in self._rows.items() if row["user_id"] == user_id]
+            for key in keys:
+                del self._rows[key]
+        return keys
+
+    def touch(self, seen):
+        max_age = timedelta(seconds=settings.SESSION_MAX_AGE)
+        with self._lock:
+            for key, at in seen.items():
+                if key in self._rows:
+                    self._rows[key].update(last_seen=at, expires_at=at + max_age)
+
+    def active(self):
+        with self._lock:
+            rows = [
+                {k: v for k, v in row.items() if k != "data"}
+                for row in self._rows.values()
+                if row["expires_at"] > datetime.utcnow()
+            ]
+        rows.sort(key=lambda row: row["expires_at"], reverse=True)
+        return rows[:ACTIVE_LIMIT]
+
+
+# ---------- store: backend + cache in-process ----------
+class SessionStore:
+    """Backend sesi dengan cache LRU+TTL di depannya.
+
+    Cache menghindari query per request. Pencabutan sesi dari worker lain
+    terlihat lewat mtime file penanda di ``CACHE_DIR`` (seperti tag
+    ``page_cache``): bila berubah sejak sesi dimuat, baris sesi dicek ulang.
+    """
+
+    def __init__(self, backend: SessionBackend, ttl: int, max_entries: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.marker = os.path.join(settings.CACHE_DIR, "sessions.revoked")
+        # key -> (data, waktu dimuat, generation penanda saat dimuat)
+        self._cache: OrderedDict[str, tuple[dict, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._seen: dict[str, datetime] = {}
+        self._last_touch = time.monotonic()
+
+    def generation(self) -> int:
+        try:
+            return os.stat(self.marker).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _bump_generation(self):
+        os.makedirs(os.path.dirname(self.marker), exist_ok=True)
+        with open(self.marker, "a"):
+            pass
+        now = max(time.time_ns(), self.generation() + 1)
+        os.utime(self.marker, ns=(now, now))
+
+    def _cached(self, key: str) -> tuple[dict, int] | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] > self.ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[0], entry[2]
+
+    def _remember(self, key: str, data: dict, generation: int):
+        with self._lock:
+            self._cache[key] = (data, time.monotonic(), generation)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _forget(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._cache.pop(key, None)
+                self._seen.pop(key, None)
+
+    def _load(self, key: str) -> tuple[dict, int] | None:
+        # generation dibaca sebelum query: pencabutan yang balapan tetap terdeteksi
+        generation = self.generation()
+        data = self.backend.load(key)
+        if data is None:
+            self._forget(key)
+            return None
+        self._remember(key, data, generation)
+        return data, generation
+
+    def get(self, token: str) -> tuple[dict, int] | None:
+        """``(data, generation)`` dari cache, atau dari backend bila tidak ada."""
+        key = _key(token)
+        return self._cached(key) or self._load(key)
+
+    def cached(self, token: str) -> tuple[dict, int] | None:
+        return self._cached(_key(token))
+
+    def reload(self, token: str) -> tuple[dict, int] | None:
+        return self._load(_key(token))
+
+    def save(self, token: str, data: dict):
+        key = _key(token)
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.SESSION_MAX_AGE)
+        generation = self.generation()
+        self.backend.save(key, data, expires_at)
+        self._remember(key, data, generation)
+
+    def delete(self, token: str, revoke: bool = True):
+        """Hapus sesi; ``revoke`` (logout) membuat worker lain mengecek ulang
+        cache-nya. Rotasi token saat login tidak perlu: token lama hanya
+        dipegang browser yang sama, dan cache-nya habis sendiri (TTL)."""
+        key = _key(token)
+        self.backend.delete(key)
+        self._forget(key)
+        if revoke:
+            self._bump_generation()
+
+    def revoke_user(self, user_id: int) -> int:
+        keys = self.backend.delete_user(user_id)
+        self._forget(*keys)
+        self._bump_generation()
+        return len(keys)
+
+    def seen(self, token: str) -> tuple[bool, bool]:
+        """Catat aktivitas; ``(pertama di interval ini, waktunya tulis batch)``.
+
+        Yang pertama dipakai untuk memperpanjang cookie sekali per
+        ``SESSION_TOUCH_INTERVAL``, seirama dengan ``expires_at`` di server.
+        """
+        key = _key(token)
+        with self._lock:
+            first = key not in self._seen
+            self._seen[key] = datetime.utcnow()
+            elapsed = time.monotonic() - self._last_touch
+        return first, elapsed >= settings.SESSION_TOUCH_INTERVAL
+
+    def flush(self):
+        with self._lock:
+            seen, self._seen = self._seen, {}
+            self._last_touch = time.monotonic()
+        try:
+            self.backend.touch(seen)
+        except Exception:
+            log.exception("failed to write session last_seen")
+
+    def active(self) -> list[dict]:
+        return self.backend.active()
+
+
+def _make_store() -> SessionStore | None:
+    if settings.SESSION_BACKEND == "cookie":
+        return None
+    if settings.SESSION_BACKEND == "memory":
+        backend = MemorySessionBackend()
+    elif settings.SESSION_BACKEND == "database":
+        backend = DatabaseSessionBackend(engine)
+    else:
+        raise ValueError(f"unknown SESSION_BACKEND {settings.SESSION_BACKEND!r}")
+    return SessionStore(
+        backend,
+        ttl=settings.SESSION_CACHE_TTL,
+        max_entries=settings.SESSION_CACHE_MAX_ENTRIES,
+    )
+
+
+session_store = _make_store()
+
+
+def is_revoked(scope) -> bool:
+    """Murah: satu ``stat`` file penanda; backend dicek hanya bila penanda berubah."""
+    meta = scope.get("session_meta")
+    if session_store is None or not meta or not meta["token"]:
+        return False
+    if session_store.generation() == meta["generation"]:
+        return False
+    loaded = session_store.reload(meta["token"])
+    if loaded is None:
+        return True
+    meta["generation"] = loaded[1]
+    return False
+
+
+# ---------- middleware ----------
+class ServerSessionMiddleware:
+    """Pengganti ``SessionMiddleware``: cookie hanya berisi token acak.
+
+    Cookie ditulis saat sesi dibuat/diganti, dan diperpanjang sekali per
+    ``SESSION_TOUCH_INTERVAL`` untuk sesi yang aktif, bukan di setiap respons.
+    Token diganti ketika user di sesi berubah (login) untuk mencegah session
+    fixation.
+    """
+
+    def __init__(self, app, store: SessionStore, https_only: bool = False):
+        self.app = app
+        self.store = store
+        self.flags = "httponly; samesite=lax" + ("; secure" if https_only else "")
+
+    async def _load(self, token: str) -> tuple[dict, int] | None:
+        # cache hit tidak menyentuh thread maupun database
+        loaded = self.store.cached(token)
+        if loaded is None:
+            loaded = await anyio.to_thread.run_sync(self.store.get, token)
+        return loaded
+
+    def _cookie(self, message, value: str, max_age: int):
+        MutableHeaders(scope=message).append(
+            "Set-Cookie",
+            f"{COOKIE_NAME}={value}; path=/; Max-Age={max_age}; {self.flags}",
+        )
+
+    def _touch(self, message, token: str):
+        headers = MutableHeaders(scope=message)
+        if "public" in headers.get("cache-control", ""):
+            # aset statis/thumbnail: jangan sisipkan cookie ke respons publik
+            return
+        refresh, flush = self.store.seen(token)
+        if refresh:
+            # touch menggeser expires_at di server; Max-Age cookie ikut digeser
+            # agar user aktif tidak logout saat cookie lama habis
+            self._cookie(message, token, settings.SESSION_MAX_AGE)
+        if flush:
+            # tulis last_seen batch tanpa menahan respons ini
+            asyncio.get_running_loop().run_in_executor(None, self.store.flush)
+
+    async def _commit(self, scope, message, before: str):
+        meta = scope["session_meta"]
+        token, session = meta["token"], scope["session"]
+        after = json.dumps(session, sort_keys=True, default=str)
+        if after == before:
+            if token:
+                self._touch(message, token)
+            return
+        if not session:
+            if token:
+                await anyio.to_thread.run_sync(self.store.delete, token)
+                self._cookie(message, "", 0)
+            return
+        if token is None or json.loads(before).get("user") != session.get("user"):
+            if token:
+                await anyio.to_thread.run_sync(self.store.delete, token, False)
+            token = secrets.token_urlsafe(32)
+            self._cookie(message, token, settings.SESSION_MAX_AGE)
+        await anyio.to_thread.run_sync(self.store.save, token, dict(session))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        token = HTTPConnection(scope).cookies.get(COOKIE_NAME) or None
+        loaded = await self._load(token) if token else None
+        data, generation = loaded or (None, 0)
+        if data is None:
+            token = None
+        scope["session"] = dict(data or {})
+        scope["session_meta"] = {"token": token, "generation": generation}
+        before = json.dumps(data or {}, sort_keys=True, default=str)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                await self._commit(scope, message, before)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
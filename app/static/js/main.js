@@ -6,3 +6,59 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   });
 });
+
+// Infinite scroll daftar anggota: ganti penanda ".members-more" dengan batch berikutnya
+document.addEventListener('DOMContentLoaded', () => {
+  const grid = document.getElementById('member-grid');
+  if (!grid || !('IntersectionObserver' in window)) return;
+  let loading = false;
+  const observer = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+      if (!entry.isIntersecting || loading) return;
+      const more = entry.target;
+      loading = true;
+      observer.unobserve(more);
+      fetch(more.dataset.next, {headers: {'X-Requested-With': 'fetch'}})
+        .then(r => r.ok ? r.text() : Promise.reject(r.status))
+        .then(html => {
+          more.insertAdjacentHTML('beforebegin', html);
+          more.remove();
+          watch();
+        })
+        .catch(() => observer.observe(more))
+        .finally(() => { loading = false; });
+    });
+  }, {rootMargin: '400px'});
+  const watch = () => grid.querySelectorAll('.members-more').forEach(el => observer.observe(el));
+  watch();
+});
+
+// Cek email saat diketik di form pendaftaran; email terpakai menahan submit
+document.addEventListener('DOMContentLoaded', () => {
+  const input = document.querySelector('input[data-availability]');
+  if (!input) return;
+  const feedback = input.form.querySelector('[data-feedback="email"]');
+  let timer, taken = false;
+  const check = () => {
+    const email = input.value.trim();
+    if (!email) return;
+    fetch(`${input.dataset.availability}?email=${encodeURIComponent(email)}`)
+      .then(r => r.ok ? r.json() : Promise.reject(r.status))
+      .then(data => {
+        if (data.email !== input.value.trim().toLowerCase()) return;
+        taken = !data.available;
+        input.classList.toggle('is-invalid', taken);
+        if (taken) feedback.textContent = 'Email sudah terdaftar.';
+      })
+      .catch(() => {});
+  };
+  input.addEventListener('input', () => {
+    taken = false;
+    input.classList.remove('is-invalid');
+    clearTimeout(timer);
+    timer = setTimeout(check, 400);
+  });
+  input.form.addEventListener('submit', e => {
+    if (taken) { e.preventDefault(); input.focus(); }
+  });
+});
@@ -0,0 +1,190 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.activity import Activity
+from app.models.member import Member
+from app.models.news import News
+from app.models.stats import StatCounter
+
+# rentang umur dashboard: (label, umur minimum)
+AGE_BANDS = [("< 25", 0), ("25-34", 25), ("35-44", 35), ("45-54", 45), ("55+", 55)]
+NO_DOB = "Tidak diisi"
+
+
+def _member_buckets(membership_type, dob, created_at) -> list[tuple[str, str]]:
+    created_at = created_at or datetime.utcnow()
+    return [
+        ("members", "all"),
+        ("membership_type", membership_type or "Reguler"),
+        ("reg_month", created_at.strftime("%Y-%m")),
+        ("reg_day", created_at.strftime("%Y-%m-%d")),
+        # umur berubah seiring waktu, jadi yang disimpan tahun lahir
+        ("birth_year", str(dob.year) if dob else ""),
+    ]
+
+
+def _bump(connection, rows: list[tuple[str, str, int]]):
+    """Tambah ``delta`` ke tiap (metric, bucket) dalam satu upsert multi-baris."""
+    if not rows:
+        return
+    dialect = connection.dialect.name
+    table = StatCounter.__table__
+    values = [{"metric": m, "bucket": b, "count": d} for m, b, d in rows]
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["metric", "bucket"],
+            set_={"count": table.c.count + stmt.excluded.count},
+        )
+        connection.execute(stmt)
+    elif dialect == "mysql":
+        stmt = mysql_insert(table).values(values)
+        stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted.count)
+        connection.execute(stmt)
+    else:
+        for metric, bucket, delta in rows:
+            result = connection.execute(
+                update(table)
+                .where(table.c.metric == metric, table.c.bucket == bucket)
+                .values(count=table.c.count + delta)
+            )
+            if result.rowcount == 0:
+                connection.execute(
+                    table.insert().values(metric=metric, bucket=bucket, count=delta)
+                )
+
+
+# ---------- pembaruan rollup di transaksi yang sama dengan perubahan data ----------
+@event.listens_for(Member, "after_insert")
+def _member_inserted(mapper, connection, target):
+    buckets = _member_buckets(target.membership_type, target.dob, target.created_at)
+    _bump(connection, [(metric, bucket, 1) for metric, bucket in buckets])
+
+
+@event.listens_for(Member, "before_delete")
+def _member_deleted(mapper, connection, target):
+    buckets = _member_buckets(target.membership_type, target.dob, target.created_at)
+    _bump(connection, [(metric, bucket, -1) for metric, bucket in buckets])
+
+
+@event.listens_for(Member, "after_update")
+def _member_updated(mapper, connection, target):
+    state = inspect(target)
+    type_hist = state.attrs.membership_type.history
+    dob_hist = state.attrs.dob.history
+    if not type_hist.has_changes() and not dob_hist.has_changes():
+        return
+    old_type = type_hist.deleted[0] if type_hist.deleted else target.membership_type
+    old_dob = dob_hist.deleted[0] if dob_hist.deleted else target.dob
+    old = _member_buckets(old_type, old_dob, target.created_at)
+    new = _member_buckets(target.membership_type, target.dob, target.created_at)
+    rows = []
+    for (metric, old_bucket), (_, new_bucket) in zip(old, new):
+        if old_bucket != new_bucket:
+            rows += [(metric, old_bucket, -1), (metric, new_bucket, 1)]
+    _bump(connection, rows)
+
+
+def bump_members(connection, members, delta: int = 1):
+    """Rollup untuk insert massal lewat Core (tanpa event ORM), satu upsert per batch.
+
+    ``members``: iterable ``(membership_type, dob, created_at)``.
+    """
+    counts: dict[tuple[str, str], int] = defaultdict(int)
+    for membership_type, dob, created_at in members:
+        for key in _member_buckets(membership_type, dob, created_at):
+            counts[key] += delta
+    _bump(connection, [(metric, bucket, n) for (metric, bucket), n in counts.items()])
+
+
+def _counter_listeners(model, metric: str):
+    @event.listens_for(model, "after_insert")
+    def _inserted(mapper, connection, target):
+        _bump(connection, [(metric, "all", 1)])
+
+    @event.listens_for(model, "before_delete")
+    def _deleted(mapper, connection, target):
+        _bump(connection, [(metric, "all", -1)])
+
+
+_counter_listeners(Activity, "activities")
+_counter_listeners(News, "news")
+
+
+def rebuild(db: Session):
+    """Hitung ulang seluruh rollup dari tabel sumber (sekali, saat rollup kosong)."""
+    counts: dict[tuple[str, str], int] = defaultdict(int)
+    rows = db.execute(
+        select(
+            Member.membership_type,
+            Member.dob,
+            Member.created_at,
+        )
+    )
+    for row in rows:
+        for key in _member_buckets(row.membership_type, row.dob, row.created_at):
+            counts[key] += 1
+    counts[("activities", "all")] = db.scalar(select(func.count(Activity.id)))
+    counts[("news", "all")] = db.scalar(select(func.count(News.id)))
+    db.query(StatCounter).delete()
+    db.add_all(
+        StatCounter(metric=metric, bucket=bucket, count=count)
+        for (metric, bucket), count in counts.items()
+    )
+    db.commit()
+
+
+def ensure_rollups(db: Session):
+    if db.query(StatCounter.metric).first() is None:
+        rebuild(db)
+
+
+def dashboard_stats(db: Session, months: int = 12, days: int = 30) -> dict:
+    """Semua angka dashboard dari satu query ke tabel rollup."""
+    by_metric: dict[str, dict[str, int]] = defaultdict(dict)
+    for metric, bucket, count in db.execute(
+        select(StatCounter.metric, StatCounter.bucket, StatCounter.count).where(
+            StatCounter.count != 0
+        )
+    ):
+        by_metric[metric][bucket] = count
+
+    today = date.today()
+    month_keys = []
+    y, m = today.year, today.month
+    for _ in range(months):
+        month_keys.append(f"{y:04d}-{m:02d}")
+        y, m = (y, m - 1) if m > 1 else (y - 1, 12)
+    day_keys = [
+        (today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)
+    ]
+
+    # umur kira-kira dari tahun lahir
+    age_bands = {label: 0 for label, _ in AGE_BANDS}
+    age_bands[NO_DOB] = 0
+    for year, count in by_metric["birth_year"].items():
+        if not year:
+            age_bands[NO_DOB] += count
+            continue
+        age = max(today.year - int(year), 0)
+        label = [label for label, low in AGE_BANDS if age >= low][-1]
+        age_bands[label] += count
+
+    return {
+        "members": by_metric["members"].get("all", 0),
+        "activities": by_metric["activities"].get("all", 0),
+        "news": by_metric["news"].get("all", 0),
+        "membership_types": dict(
+            sorted(by_metric["membership_type"].items(), key=lambda kv: -kv[1])
+        ),
+        "per_month": [
+            (k, by_metric["reg_month"].get(k, 0)) for k in reversed(month_keys)
+        ],
+        "per_day": [(k, by_metric["reg_day"].get(k, 0)) for k in reversed(day_keys)],
+        "age_bands": age_bands,
+    }
@@ -0,0 +1,49 @@
+import functools
+import hashlib
+import os
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.config import settings
+from app.thumbnails import source_rel, srcset_widths
+
+TEMPLATE_DIR = "app/templates"
+
+# satu environment untuk semua router: base.html dkk. cukup dikompilasi sekali,
+# dan bytecode-nya disimpan di disk untuk dipakai worker Passenger berikutnya
+_bytecode_dir = os.path.join(settings.CACHE_DIR, "jinja")
+os.makedirs(_bytecode_dir, exist_ok=True)
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=FileSystemBytecodeCache(_bytecode_dir),
+)
+# _photo.html memakai aturan path & ukuran thumbnail yang sama dengan /media
+env.globals.update(photo_source_rel=source_rel, photo_srcset_widths=srcset_widths)
+templates = Jinja2Templates(env=env)
+
+
+def precompile() -> int:
+    """Muat semua template (mengisi cache bytecode); kembalikan jumlahnya."""
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+@functools.cache
+def template_version() -> str:
+    """Hash nama+mtime semua template; berubah setiap deploy template baru."""
+    digest = hashlib.sha1()
+    for name in sorted(env.list_templates()):
+        mtime = os.path.getmtime(os.path.join(TEMPLATE_DIR, name))
+        digest.update(f"{name}:{mtime}".encode())
+    return digest.hexdigest()[:8]
+
+
+if __name__ == "__main__":
+    # python -m app.templating  -> kompilasi semua template saat deploy
+    print(f"{precompile()} templates compiled")
@@ -0,0 +1,112 @@
+import functools
+import logging
+import os
+
+from app.config import settings
+from app.jobs import handler
+from app.uploads import ALLOWED_EXT, UPLOAD_URL_PREFIX
+
+log = logging.getLogger(__name__)
+
+# nama ukuran -> lebar maksimum (px); tinggi mengikuti rasio foto
+SIZES = {"list": 96, "card": 480, "print": 800}
+FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+QUALITY = 80
+
+
+def thumb_root() -> str:
+    return os.path.join(settings.UPLOAD_FOLDER, "_thumbs")
+
+
+def source_rel(photo: str | None) -> str | None:
+    """Path foto relatif ke UPLOAD_FOLDER, atau None bila bukan file upload lokal."""
+    prefix = UPLOAD_URL_PREFIX + "/"
+    if not photo or not photo.startswith(prefix):
+        return None
+    rel = os.path.normpath(photo[len(prefix) :])
+    if rel.startswith("..") or os.path.isabs(rel):
+        return None
+    # bukan turunan di _thumbs/ maupun file sementara upload (*.part)
+    if rel.split(os.sep, 1)[0].startswith(("_", ".")):
+        return None
+    if rel.rsplit(".", 1)[-1].lower() not in ALLOWED_EXT:
+        return None
+    return rel
+
+
+@functools.lru_cache(maxsize=4096)
+def srcset_widths(rel: str) -> tuple[tuple[str, int], ...]:
+    """``(ukuran, lebar hasil sebenarnya)`` untuk descriptor ``w`` srcset.
+
+    Foto tidak pernah diperbesar: ukuran yang lebih lebar dari aslinya
+    menghasilkan file selebar foto asli, jadi hanya ukuran pertama yang
+    mencapai lebar itu yang dicantumkan. Nama file upload adalah hash isinya,
+    sehingga hasilnya aman di-cache tanpa batas waktu.
+    """
+    try:
+        from PIL import Image
+    except ImportError:  # tanpa Pillow /media/thumb mengalihkan ke foto asli
+        return tuple(SIZES.items())
+    try:
+        # hanya header yang dibaca, bukan data piksel
+        with Image.open(os.path.join(settings.UPLOAD_FOLDER, rel)) as img:
+            width, height = img.size
+            # orientasi EXIF 5-8 diputar 90 derajat oleh exif_transpose
+            if img.getexif().get(0x0112) in (5, 6, 7, 8):
+                width, height = height, width
+    except (OSError, ValueError):
+        return tuple(SIZES.items())
+    widths = []
+    for size, target in SIZES.items():
+        # batas sama dengan generate(): kotak (target, 2 x target), tanpa perbesar
+        scale = min(1, target / width, target * 2 / height)
+        actual = max(1, round(width * scale))
+        if widths and actual <= widths[-1][1]:
+            continue
+        widths.append((size, actual))
+    return tuple(widths)
+
+
+def thumb_path(rel: str, size: str, fmt: str) -> str:
+    base, _ = os.path.splitext(rel)
+    return os.path.join(thumb_root(), size, f"{base}.{fmt}")
+
+
+def generate(rel: str, size: str, fmt: str) -> str | None:
+    """Buat (bila belum ada) satu turunan foto; kembalikan path file-nya."""
+    if size not in SIZES or fmt not in FORMATS:
+        return None
+    try:
+        # diimpor saat dibutuhkan saja: Pillow menambah waktu start worker
+        from PIL import Image, ImageOps
+    except ImportError:  # Pillow opsional: tanpa Pillow foto asli yang dipakai
+        return None
+    dest = thumb_path(rel, size, fmt)
+    if os.path.exists(dest):
+        return dest
+    src = os.path.join(settings.UPLOAD_FOLDER, rel)
+    try:
+        with Image.open(src) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((SIZES[size], SIZES[size] * 2))
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            tmp = f"{dest}.{os.getpid()}.part"
+            img.save(tmp, FORMATS[fmt], quality=QUALITY)
+            os.replace(tmp, dest)
+    except (OSError, ValueError) as e:
+        log.warning("thumbnail %s/%s for %s failed: %s", size, fmt, rel, e)
+        return None
+    return dest
+
+
+@handler("thumbnails")
+def generate_all(photo: str | None):
+    """Buat semua turunan untuk foto yang baru di-upload (job latar)."""
+    rel = source_rel(photo)
+    if rel is None:
+        return
+    for size in SIZES:
+        for fmt in FORMATS:
+            generate(rel, size, fmt)
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import tempfile
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import PlainTextResponse
+
+from app.config import settings
+
+ALLOWED_EXT = {"png", "jpg", "jpeg", "gif", "webp"}
+CHUNK_SIZE = 64 * 1024
+MB = 1024 * 1024
+# ruang untuk field form lain di samping foto dalam satu body multipart
+FORM_OVERHEAD = 1 * MB
+# path publik (relatif ke root situs) untuk file di UPLOAD_FOLDER
+UPLOAD_URL_PREFIX = "static/img/uploads"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """Tolak body request yang melebihi batas sebelum multipart di-parse.
+
+    Starlette menerima seluruh body dan men-spool file upload ke disk sebelum
+    route berjalan, jadi batas harus dipasang di sini: ``Content-Length``
+    diperiksa lebih dulu (413 tanpa membaca body), body chunked dihitung
+    sambil diterima. ``limits`` memberi batas lain per path.
+    """
+
+    def __init__(self, app, max_bytes: int, limits: dict[str, int] | None = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.limits = limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limit = self.limits.get(scope["path"], self.max_bytes)
+        length = Headers(scope=scope).get("content-length", "")
+        if length.isdigit() and int(length) > limit:
+            response = PlainTextResponse("Request terlalu besar.", status_code=413)
+            return await response(scope, receive, send)
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # HTTPException diteruskan FastAPI apa adanya -> 413
+                    raise HTTPException(413, "Request terlalu besar.")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def allowed_file(filename: str) -> bool:
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXT
+
+
+def _extension(filename: str) -> str:
+    ext = filename.rsplit(".", 1)[1].lower() if "." in filename else "bin"
+    return "jpg" if ext == "jpeg" else ext
+
+
+def shard_path(digest: str, ext: str) -> str:
+    """``ab/cd/abcd....ext`` — dua level subfolder agar folder tidak membengkak."""
+    return os.path.join(digest[:2], digest[2:4], f"{digest}.{ext}")
+
+
+def _store(src, ext: str, max_bytes: int) -> str:
+    os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=settings.UPLOAD_FOLDER, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := src.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(size)
+                digest.update(chunk)
+                out.write(chunk)
+        rel = shard_path(digest.hexdigest(), ext)
+        dest = os.path.join(settings.UPLOAD_FOLDER, rel)
+        if os.path.exists(dest):
+            # foto identik sudah tersimpan -> pakai yang lama
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(tmp_path, dest)
+        return rel
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+async def save_upload(upload: UploadFile) -> str:
+    """Simpan upload ke ``UPLOAD_FOLDER`` dan kembalikan path publiknya.
+
+    File dibaca per potongan di threadpool (tidak memblokir event loop) dan
+    dinamai dengan hash SHA-256 isinya sehingga foto yang sama hanya disimpan
+    sekali. Body yang jauh lebih besar sudah ditolak ``BodySizeLimitMiddleware``;
+    di sini foto dicek terhadap ``MAX_CONTENT_LENGTH_MB`` agar form bisa
+    menampilkan pesan (``UploadTooLarge``).
+    """
+    max_bytes = settings.MAX_CONTENT_LENGTH_MB * MB
+    await upload.seek(0)
+    rel = await run_in_threadpool(
+        _store, upload.file, _extension(upload.filename or ""), max_bytes
+    )
+    return f"{UPLOAD_URL_PREFIX}/{rel.replace(os.sep, '/')}"
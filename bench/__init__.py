@@ -0,0 +1 @@
+# benchmark package: python -m bench --help
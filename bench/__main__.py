@@ -0,0 +1,126 @@
+"""Benchmark koperasi.
+
+  python -m bench seed --members 100000 --news 10000 --activities 10000
+  python -m bench explain   (exit 1 bila ada query scan penuh/sort)
+  python -m bench startup --budget-ms 1500 --baseline bench/results/startup-base.json
+  python -m bench run --target both --requests 200 --out bench/results/latest.json \\
+      --baseline bench/results/baseline.json
+
+Database default-nya SQLite lokal (bench/bench.db), bukan DATABASE_URL aplikasi,
+agar benchmark tidak pernah menyentuh database produksi secara tidak sengaja.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+
+def _configure(args):
+    # harus sebelum modul app diimpor: Settings membaca environment saat import
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("UPLOAD_FOLDER", os.path.join(BENCH_DIR, "uploads"))
+    os.environ.setdefault("CACHE_DIR", os.path.join(BENCH_DIR, ".cache"))
+    os.chdir(ROOT_DIR)
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("BENCH_DATABASE_URL")
+        or f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_seed = sub.add_parser("seed", help="isi database dengan data sintetis")
+    p_seed.add_argument("--members", type=int, default=100_000)
+    p_seed.add_argument("--news", type=int, default=10_000)
+    p_seed.add_argument("--activities", type=int, default=10_000)
+    p_seed.add_argument("--seed", type=int, default=42)
+
+    p_run = sub.add_parser("run", help="ukur throughput dan latency per route")
+    p_run.add_argument("--target", choices=["asgi", "wsgi", "both"], default="both")
+    p_run.add_argument("--requests", type=int, default=100)
+    p_run.add_argument("--concurrency", type=int, default=4)
+    p_run.add_argument("--warmup", type=int, default=5)
+    p_run.add_argument(
+        "--route", action="append", help="hanya route ini (boleh berulang)"
+    )
+    p_run.add_argument(
+        "--out", default=os.path.join(BENCH_DIR, "results", "latest.json")
+    )
+    p_run.add_argument("--baseline", help="JSON hasil sebelumnya untuk dibandingkan")
+    p_run.add_argument("--tolerance", type=float, default=0.10)
+
+    p_start = sub.add_parser(
+        "startup", help="waktu import app.main + startup worker (-X importtime)"
+    )
+    p_start.add_argument("--runs", type=int, default=5)
+    p_start.add_argument("--top", type=int, default=15)
+    p_start.add_argument("--budget-ms", type=float, help="gagal bila total melebihi")
+    p_start.add_argument(
+        "--out", default=os.path.join(BENCH_DIR, "results", "startup.json")
+    )
+    p_start.add_argument("--baseline", help="JSON hasil sebelumnya untuk dibandingkan")
+    p_start.add_argument("--tolerance", type=float, default=0.20)
+
+    p_explain = sub.add_parser(
+        "explain", help="EXPLAIN setiap query route; gagal bila ada scan penuh/sort"
+    )
+    p_explain.add_argument("--verbose", action="store_true", help="tampilkan semua plan")
+
+    args = parser.parse_args(argv)
+    _configure(args)
+
+    if args.command == "seed":
+        from bench.seed import seed
+
+        print(json.dumps(seed(args.members, args.news, args.activities, args.seed)))
+        return 0
+
+    if args.command == "startup":
+        from bench import startup
+        from bench.run import save
+
+        report = startup.run(args.runs, args.top)
+        print(f"import {report['import_ms']} ms, startup {report['startup_ms']} ms")
+        for row in report["slowest_modules"]:
+            print(f"  {row['self_ms']:8.1f} ms  {row['module']}")
+        save(report, args.out)
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        problems = startup.check(report, args.budget_ms, baseline, args.tolerance)
+        for problem in problems:
+            print("regression: " + problem)
+        return 1 if problems else 0
+
+    if args.command == "explain":
+        from bench import explain
+
+        return explain.run(args.verbose)
+
+    from bench.run import compare, run, save
+
+    targets = ["asgi", "wsgi"] if args.target == "both" else [args.target]
+    report = run(targets, args.requests, args.concurrency, args.warmup, args.route)
+    save(report, args.out)
+    print(f"saved {args.out}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("regressions: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
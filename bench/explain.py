@@ -0,0 +1,283 @@
+import re
+from dataclasses import dataclass, field
+
+from bench.run import AsgiDriver, Route, _login, routes, sample_ids
+
+# router yang setiap route GET-nya wajib dilewati harness ini
+ROUTER_MODULES = ("app.routers.home", "app.routers.members", "app.routers.admin")
+
+# route GET yang sengaja tidak dicek, beserta alasannya
+SKIP = {
+    "admin_members_export": "ekspor memang membaca seluruh tabel (stream per chunk)",
+}
+
+# tabel kecil berukuran tetap: scan penuh tidak tumbuh bersama data
+SMALL_TABLES = {"stat_counters", "schema_version"}
+
+# statement yang boleh membaca seluruh tabel
+ALLOW = [
+    (
+        re.compile(r"^SELECT members\.id, members\.name, members\.occupation, "),
+        "indeks trigram pencarian dibangun dari seluruh tabel (di-cache)",
+    ),
+    (
+        re.compile(r"^SELECT members\.email\s+FROM members$"),
+        "bloom filter email dibangun dari seluruh tabel (di-cache per worker)",
+    ),
+]
+
+
+@dataclass
+class Statement:
+    sql: str
+    params: object
+    routes: set[str] = field(default_factory=set)
+    plan: list[str] = field(default_factory=list)
+    problems: list[str] = field(default_factory=list)
+
+
+def _next_cursors() -> dict[str, str]:
+    # cursor halaman ke-2, agar query memakai filter keyset
+    from app.database import SessionLocal
+    from app.models.activity import Activity
+    from app.models.job import Job
+    from app.models.member import Member
+    from app.models.news import News
+    from app.pagination import keyset_page
+
+    with SessionLocal() as db:
+        return {
+            name: keyset_page(db.query(model), column, model.id, "", 10)[1] or ""
+            for name, model, column in (
+                ("member", Member, Member.created_at),
+                ("news", News, News.created_at),
+                ("activity", Activity, Activity.date),
+                ("job", Job, Job.created_at),
+            )
+        }
+
+
+def extra_routes(ids: dict) -> list[Route]:
+    """Varian yang tidak ada di benchmark: halaman ke-2 (cursor) & form lain."""
+    c = _next_cursors()
+    m, n, a = ids["member"], ids["news"], ids["activity"]
+    return [
+        Route("news_page2", f"/news?cursor={c['news']}"),
+        Route("activities_page2", f"/activities?cursor={c['activity']}"),
+        Route("activities_past", "/activities?when=past"),
+        Route(
+            "activities_past_page2", f"/activities?when=past&cursor={c['activity']}"
+        ),
+        Route("activities_calendar_month", "/activities/calendar?month=2024-02"),
+        Route("members_page2", f"/members?cursor={c['member']}"),
+        Route("members_fragment_page2", f"/members/fragment?cursor={c['member']}"),
+        Route(
+            "admin_members_page2", f"/admin/members?cursor={c['member']}", admin=True
+        ),
+        Route("admin_news_page2", f"/admin/news?cursor={c['news']}", admin=True),
+        Route(
+            "admin_activities_page2",
+            f"/admin/activities?cursor={c['activity']}",
+            admin=True,
+        ),
+        Route("admin_jobs_failed", "/admin/jobs?status=failed", admin=True),
+        Route(
+            "admin_jobs_failed_page2",
+            f"/admin/jobs?status=failed&cursor={c['job']}",
+            admin=True,
+        ),
+        Route("admin_jobs_page2", f"/admin/jobs?cursor={c['job']}", admin=True),
+        Route("admin_pool", "/admin/pool", admin=True),
+        Route("admin_sql_profile", "/admin/sql-profile", admin=True),
+        Route("admin_sessions", "/admin/sessions", admin=True),
+        Route("admin_activity_new", "/admin/activities/new", admin=True),
+        Route("admin_news_new", "/admin/news/new", admin=True),
+        Route("admin_members_import", "/admin/members/import", admin=True),
+        Route("admin_member_cards", "/admin/members/cards", admin=True),
+        Route(
+            "admin_member_cards_ids",
+            f"/admin/members/cards/sheet?ids={max(m - 40, 1)}-{m}",
+            admin=True,
+        ),
+        Route(
+            "admin_member_cards_dates",
+            "/admin/members/cards/sheet?joined_from=2024-01-01&joined_to=2024-01-07",
+            admin=True,
+        ),
+        Route(
+            "admin_member_cards_type",
+            "/admin/members/cards/sheet?membership_type=Premium",
+            admin=True,
+        ),
+        Route("news_detail_missing", f"/news/{n + 1000}"),
+        Route("activity_detail_missing", f"/activities/{a + 1000}"),
+    ]
+
+
+def _cursor_rows(ids: dict) -> dict:
+    # baris di tengah tabel, agar halaman berikutnya memakai filter keyset
+    from app.database import SessionLocal
+    from app.models.activity import Activity
+    from app.models.member import Member
+    from app.models.news import News
+
+    with SessionLocal() as db:
+        return {
+            "member": (
+                db.get(Member, ids["member"] // 2 or 1).created_at,
+                ids["member"] // 2,
+            ),
+            "news": (db.get(News, ids["news"] // 2 or 1).created_at, ids["news"] // 2),
+            "activity": (
+                db.get(Activity, ids["activity"] // 2 or 1).date,
+                ids["activity"] // 2,
+            ),
+        }
+
+
+def _route_names(app, path: str) -> list[str]:
+    from starlette.routing import Match
+
+    scope = {"type": "http", "path": path.split("?", 1)[0], "method": "GET"}
+    return [
+        route.name
+        for route in app.routes
+        if getattr(route, "endpoint", None) is not None
+        and route.matches(scope)[0] == Match.FULL
+    ]
+
+
+def required_routes(app) -> set[str]:
+    return {
+        route.name
+        for route in app.routes
+        if "GET" in (getattr(route, "methods", None) or ())
+        and route.endpoint.__module__ in ROUTER_MODULES
+    }
+
+
+def capture(requests: list[Route]) -> tuple[dict[str, Statement], set[str]]:
+    """Jalankan setiap route lewat ASGI; kumpulkan statement SQL per route."""
+    from sqlalchemy import event
+
+    from app.cache import page_cache
+    from app.database import engine
+
+    statements: dict[str, Statement] = {}
+    covered: set[str] = set()
+    current = {"route": ""}
+
+    def before_cursor_execute(conn, cursor, sql, params, context, executemany):
+        verb = sql.lstrip().split(None, 1)[0].upper()
+        if executemany or verb not in ("SELECT", "UPDATE", "DELETE"):
+            return
+        statement = statements.setdefault(sql, Statement(sql, params))
+        statement.routes.add(current["route"])
+
+    driver = AsgiDriver()
+    try:
+        cookie = _login(driver)
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        for route in requests:
+            if route.method != "GET":
+                continue
+            current["route"] = route.name
+            # page cache in-process akan menyembunyikan query halaman publik
+            page_cache.clear()
+            headers = {"cookie": cookie} if route.admin else {}
+            status, _, _ = driver.request("GET", route.path, headers=headers)
+            if status >= 500:
+                raise RuntimeError(f"{route.path} -> {status}")
+            covered.update(_route_names(driver.app, route.path))
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    finally:
+        driver.close()
+    return statements, covered
+
+
+def _scan_problem(sql: str) -> str | None:
+    """Scan tabel besar boleh hanya bila berhenti di LIMIT tanpa menyaring baris.
+
+    Tanpa LIMIT berarti membaca seluruh tabel; dengan WHERE berarti baris
+    dilewati satu per satu (mis. keyset ``a < ? OR ...`` yang tidak memakai
+    indeks sebagai range) dan biayanya ikut tumbuh bersama tabel.
+    """
+    if any(pattern.search(sql) for pattern, _ in ALLOW):
+        return None
+    if not re.search(r"\bLIMIT\b", sql):
+        return "full scan"
+    if re.search(r"\bWHERE\b", sql):
+        return "filtered scan"
+    return None
+
+
+def explain(engine, statement: Statement):
+    sql = statement.sql
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", statement.params)
+            for row in rows:
+                detail = row[-1]
+                statement.plan.append(detail)
+                words = detail.split()
+                if "TEMP B-TREE" in detail:
+                    statement.problems.append(f"sort: {detail}")
+                elif words[0] == "SCAN" and words[1] not in SMALL_TABLES:
+                    problem = words[1] != "CONSTANT" and _scan_problem(sql)
+                    if problem:
+                        statement.problems.append(f"{problem}: {detail}")
+        else:
+            # MySQL/MariaDB: type ALL/index = scan penuh; Extra "Using filesort"
+            rows = conn.exec_driver_sql(f"EXPLAIN {sql}", statement.params)
+            for row in rows.mappings():
+                table, kind = row.get("table"), row.get("type")
+                extra = row.get("Extra") or ""
+                statement.plan.append(
+                    f"{table} type={kind} key={row.get('key')} {extra}".strip()
+                )
+                if "filesort" in extra:
+                    statement.problems.append(f"filesort: {table} {extra}")
+                elif kind in ("ALL", "index") and table not in SMALL_TABLES:
+                    problem = _scan_problem(sql)
+                    if problem:
+                        statement.problems.append(f"{problem}: {table} type={kind}")
+
+
+def run(verbose: bool = False) -> int:
+    from app.database import engine
+    from app.main import app
+    from app.schema import ensure_schema
+
+    ensure_schema(engine)
+    with engine.connect() as conn:
+        empty = not conn.exec_driver_sql("SELECT 1 FROM members LIMIT 1").first()
+    if empty:
+        # planner butuh data yang cukup agar plan-nya mewakili produksi
+        from bench.seed import seed
+
+        seed(members=5000, news=500, activities=500)
+    ids = sample_ids()
+    requests = [*routes(ids), *extra_routes(ids)]
+    statements, covered = capture(requests)
+
+    failures = 0
+    for statement in statements.values():
+        explain(engine, statement)
+        if statement.problems or verbose:
+            sql = " ".join(statement.sql.split())
+            print(f"{'FAIL' if statement.problems else 'ok  '} {sql[:160]}")
+            print(f"     routes: {', '.join(sorted(statement.routes))}")
+            for line in statement.plan:
+                print(f"     plan: {line}")
+            for problem in statement.problems:
+                print(f"     !! {problem}")
+        failures += bool(statement.problems)
+
+    missing = required_routes(app) - covered - set(SKIP)
+    for name in sorted(missing):
+        print(f"FAIL route {name} tidak dicek: tambahkan ke bench/explain.py")
+    print(
+        f"{len(statements)} statements, {failures} with scan/sort, "
+        f"{len(missing)} routes not covered"
+    )
+    return 1 if failures or missing else 0
@@ -0,0 +1,368 @@
+import asyncio
+import io
+import json
+import os
+import platform
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+ADMIN_USER = os.environ.get("ADMIN_USER", "admin")
+ADMIN_PASS = os.environ.get("ADMIN_PASS", "admin123")
+
+
+@dataclass
+class Route:
+    name: str
+    path: str
+    method: str = "GET"
+    form: dict | None = None
+    admin: bool = False
+
+
+def routes(ids: dict) -> list[Route]:
+    """Route home, members, register, auth dan admin (kecuali yang menghapus data)."""
+    m, n, a = ids["member"], ids["news"], ids["activity"]
+    return [
+        # home
+        Route("home", "/"),
+        Route("news", "/news"),
+        Route("news_detail", f"/news/{n}"),
+        Route("activities", "/activities"),
+        Route("activity_detail", f"/activities/{a}"),
+        Route("activities_calendar", "/activities/calendar"),
+        Route("activities_ics", "/activities.ics"),
+        # members
+        Route("members", "/members"),
+        Route("members_search", "/members?q=setiawan"),
+        Route("members_fragment", "/members/fragment"),
+        Route("member_detail", f"/members/{m}"),
+        # register
+        Route("register", "/register"),
+        Route("register_submit", "/register", "POST", {"name": "Bench", "phone": "08"}),
+        Route(
+            "register_email_taken", "/register/email-available?email=anggota1@contoh.id"
+        ),
+        Route("register_email_free", "/register/email-available?email=baru@contoh.id"),
+        # auth
+        Route("login", "/login"),
+        Route(
+            "login_submit",
+            "/login",
+            "POST",
+            {"username": ADMIN_USER, "password": ADMIN_PASS},
+        ),
+        # admin
+        Route("admin_dashboard", "/admin", admin=True),
+        Route("admin_members", "/admin/members", admin=True),
+        Route("admin_members_search", "/admin/members?q=budi", admin=True),
+        Route("admin_member_edit", f"/admin/members/{m}/edit", admin=True),
+        Route("admin_member_card", f"/admin/members/{m}/card", admin=True),
+        Route("admin_news", "/admin/news", admin=True),
+        Route("admin_news_edit", f"/admin/news/{n}/edit", admin=True),
+        Route("admin_activities", "/admin/activities", admin=True),
+        Route("admin_activity_edit", f"/admin/activities/{a}/edit", admin=True),
+        Route("admin_jobs", "/admin/jobs", admin=True),
+    ]
+
+
+# ---------- driver: ASGI langsung & adapter passenger_wsgi ----------
+class AsgiDriver:
+    name = "asgi"
+
+    def __init__(self):
+        from app.main import app
+
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self._lifespan = None
+        self.loop.run_until_complete(self._startup())
+
+    async def _startup(self):
+        queue, started = asyncio.Queue(), asyncio.Event()
+
+        async def receive():
+            return await queue.get()
+
+        async def send(message):
+            if message["type"].startswith("lifespan.startup"):
+                started.set()
+
+        self._lifespan = (
+            queue,
+            asyncio.ensure_future(
+                self.app(
+                    {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}},
+                    receive,
+                    send,
+                )
+            ),
+        )
+        await queue.put({"type": "lifespan.startup"})
+        await started.wait()
+
+    async def _request(self, method, path, body, headers):
+        parts = urlsplit(path)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+            "state": {},
+        }
+        sent = {"done": False}
+        status, resp_headers, chunks = 500, [], []
+
+        async def receive():
+            if not sent["done"]:
+                sent["done"] = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            nonlocal status, resp_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                resp_headers = [(k.decode(), v.decode()) for k, v in message["headers"]]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, resp_headers, b"".join(chunks)
+
+    def request(self, method, path, body=b"", headers=None):
+        return self.loop.run_until_complete(
+            self._request(method, path, body, headers or {})
+        )
+
+    def close(self):
+        queue, task = self._lifespan
+        self.loop.run_until_complete(queue.put({"type": "lifespan.shutdown"}))
+        self.loop.run_until_complete(asyncio.wait([task], timeout=5))
+        self.loop.close()
+
+
+class WsgiDriver:
+    name = "wsgi"
+
+    def __init__(self):
+        import passenger_wsgi
+
+        self.app = passenger_wsgi.application
+
+    def request(self, method, path, body=b"", headers=None):
+        parts = urlsplit(path)
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "CONTENT_LENGTH": str(len(body)),
+        }
+        for k, v in (headers or {}).items():
+            key = k.upper().replace("-", "_")
+            environ[key if key in ("CONTENT_TYPE",) else f"HTTP_{key}"] = v
+        out = {}
+
+        def start_response(status, resp_headers, exc_info=None):
+            out["status"], out["headers"] = int(status.split()[0]), resp_headers
+
+        result = self.app(environ, start_response)
+        try:
+            data = b"".join(result)
+        finally:
+            getattr(result, "close", lambda: None)()
+        return out["status"], out["headers"], data
+
+    def close(self):
+        pass
+
+
+# ---------- pengukuran ----------
+@dataclass
+class RouteResult:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[k]
+
+
+def _login(driver) -> str:
+    body = urlencode({"username": ADMIN_USER, "password": ADMIN_PASS}).encode()
+    _, headers, _ = driver.request(
+        "POST", "/login", body, {"content-type": "application/x-www-form-urlencoded"}
+    )
+    cookie = SimpleCookie()
+    for k, v in headers:
+        if k.lower() == "set-cookie":
+            cookie.load(v)
+    return "; ".join(f"{k}={m.value}" for k, m in cookie.items())
+
+
+def _prepare(route: Route, cookie: str, seq: int):
+    headers = {"cookie": cookie} if route.admin else {}
+    body = b""
+    if route.form is not None:
+        form = dict(route.form)
+        if route.name == "register_submit":
+            form["email"] = f"bench-{os.getpid()}-{time.time_ns()}-{seq}@contoh.id"
+        body = urlencode(form).encode()
+        headers["content-type"] = "application/x-www-form-urlencoded"
+    return body, headers
+
+
+def bench_route(
+    driver, route: Route, cookie: str, requests: int, concurrency: int
+) -> RouteResult:
+    result = RouteResult()
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        while True:
+            with lock:
+                seq = next(counter, None)
+            if seq is None:
+                return
+            body, headers = _prepare(route, cookie, seq)
+            t0 = time.perf_counter()
+            try:
+                status, _, _ = driver.request(route.method, route.path, body, headers)
+                ok = status < 400
+            except Exception:
+                ok = False
+            took = time.perf_counter() - t0
+            with lock:
+                result.latencies.append(took)
+                if not ok:
+                    result.errors += 1
+
+    # ASGI driver memakai satu event loop -> dijalankan berurutan
+    n = concurrency if isinstance(driver, WsgiDriver) else 1
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def summarize(result: RouteResult) -> dict:
+    ms = [x * 1000 for x in result.latencies]
+    return {
+        "requests": len(ms),
+        "errors": result.errors,
+        "rps": round(len(ms) / result.elapsed, 2) if result.elapsed else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+
+def sample_ids() -> dict:
+    from sqlalchemy import func, select
+
+    from app.database import SessionLocal
+    from app.models.activity import Activity
+    from app.models.member import Member
+    from app.models.news import News
+
+    with SessionLocal() as db:
+        return {
+            "member": db.scalar(select(func.max(Member.id))) or 1,
+            "news": db.scalar(select(func.max(News.id))) or 1,
+            "activity": db.scalar(select(func.max(Activity.id))) or 1,
+        }
+
+
+def run(
+    targets: list[str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    only: list[str] | None = None,
+) -> dict:
+    ids = sample_ids()
+    report = {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": os.environ.get("DATABASE_URL", ""),
+        "requests": requests,
+        "concurrency": concurrency,
+        "targets": {},
+    }
+    for target in targets:
+        driver = AsgiDriver() if target == "asgi" else WsgiDriver()
+        try:
+            cookie = _login(driver)
+            results = {}
+            for route in routes(ids):
+                if only and route.name not in only:
+                    continue
+                if warmup:
+                    bench_route(driver, route, cookie, warmup, 1)
+                res = summarize(
+                    bench_route(driver, route, cookie, requests, concurrency)
+                )
+                results[route.name] = res
+                print(
+                    f"[{target}] {route.name:<22} {res['rps']:>9.1f} req/s  "
+                    f"p50 {res['p50_ms']:>8.2f}  p95 {res['p95_ms']:>8.2f}  "
+                    f"p99 {res['p99_ms']:>8.2f} ms  errors {res['errors']}"
+                )
+            report["targets"][target] = results
+        finally:
+            driver.close()
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regresi: p95 naik atau throughput turun lebih dari ``tolerance`` (0.1 = 10%)."""
+    regressions = []
+    for target, results in report["targets"].items():
+        base_results = baseline.get("targets", {}).get(target, {})
+        for name, res in results.items():
+            base = base_results.get(name)
+            if not base:
+                continue
+            p95_delta = (
+                (res["p95_ms"] - base["p95_ms"]) / base["p95_ms"]
+                if base["p95_ms"]
+                else 0.0
+            )
+            rps_delta = (res["rps"] - base["rps"]) / base["rps"] if base["rps"] else 0.0
+            print(f"[{target}] {name:<22} p95 {p95_delta:+7.1%}  rps {rps_delta:+7.1%}")
+            if p95_delta > tolerance or rps_delta < -tolerance:
+                regressions.append(f"{target}:{name}")
+    return regressions
+
+
+def save(report: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
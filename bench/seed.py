@@ -0,0 +1,142 @@
+import io
+import os
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+FIRST = [
+    "Budi", "Siti", "Agus", "Dewi", "Rina", "Joko", "Sri", "Andi", "Nur", "Putu",
+    "Made", "Wayan", "Ayu", "Rizky", "Fitri", "Hendra", "Yohanes", "Ika", "Bambang",
+    "Lestari",
+]  # fmt: skip
+LAST = [
+    "Santoso", "Wijaya", "Setiawan", "Saputra", "Hidayat", "Pratama", "Kusuma",
+    "Nugroho", "Siregar", "Simanjuntak", "Gunawan", "Rahmawati", "Sétiawan", "Lubis",
+    "Hasibuan",
+]  # fmt: skip
+JOBS = [
+    "Petani", "Guru", "Pedagang", "Nelayan", "Wiraswasta", "PNS", "Karyawan",
+    "Mahasiswa",
+]  # fmt: skip
+TYPES = ["Reguler", "Premium", "Pelajar"]
+PHOTO_VARIANTS = 20
+BATCH = 5000
+
+
+def _photos() -> list[str]:
+    """Buat beberapa foto JPEG sintetis di UPLOAD_FOLDER (dipakai bergantian)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return []
+    from app.config import settings
+    from app.uploads import UPLOAD_URL_PREFIX, shard_path
+    import hashlib
+
+    paths = []
+    for i in range(PHOTO_VARIANTS):
+        img = Image.new("RGB", (1600, 1200), (40 + i * 10, 90, 160 - i * 5))
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=90)
+        data = buf.getvalue()
+        rel = shard_path(hashlib.sha256(data).hexdigest(), "jpg")
+        dest = os.path.join(settings.UPLOAD_FOLDER, rel)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if not os.path.exists(dest):
+            with open(dest, "wb") as f:
+                f.write(data)
+        paths.append(f"{UPLOAD_URL_PREFIX}/{rel.replace(os.sep, '/')}")
+    return paths
+
+
+def _batches(rows, size=BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(members: int, news: int, activities: int, seed_value: int = 42) -> dict:
+    """Isi database dengan data sintetis (insert batch via Core), lalu bangun rollup."""
+    from app.database import SessionLocal, engine
+    from app.models.activity import Activity
+    from app.models.member import Member
+    from app.models.news import News
+    from app.schema import ensure_schema
+    from app.seed import ensure_admin
+    from app.stats import rebuild
+
+    ensure_schema(engine)
+    rng = random.Random(seed_value)
+    photos = _photos()
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        start = conn.scalar(select(func.count(Member.id))) or 0
+
+        def member_rows():
+            for i in range(start, start + members):
+                name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+                yield {
+                    "name": name,
+                    "email": f"anggota{i}@contoh.id",
+                    "phone": f"08{rng.randrange(10**9, 10**10)}",
+                    "address": f"Jl. Koperasi No. {i % 500}",
+                    "dob": date(1950, 1, 1)
+                    + timedelta(days=rng.randrange(0, 365 * 55)),
+                    "occupation": rng.choice(JOBS),
+                    "membership_type": rng.choice(TYPES),
+                    "photo": (
+                        rng.choice(photos) if photos and rng.random() < 0.7 else None
+                    ),
+                    "created_at": now
+                    - timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 3)),
+                }
+
+        def news_rows():
+            for i in range(news):
+                yield {
+                    "title": f"Berita koperasi #{i}",
+                    "body": "<p>" + "Isi berita koperasi. " * 40 + "</p>",
+                    "created_at": now
+                    - timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 3)),
+                }
+
+        def activity_rows():
+            for i in range(activities):
+                yield {
+                    "title": f"Kegiatan #{i}",
+                    "description": "<p>" + "Deskripsi kegiatan. " * 30 + "</p>",
+                    "date": date.today() + timedelta(days=rng.randrange(-900, 365)),
+                    "location": "Aula Koperasi",
+                    "created_at": now
+                    - timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 3)),
+                }
+
+        for model, rows in (
+            (Member, member_rows()),
+            (News, news_rows()),
+            (Activity, activity_rows()),
+        ):
+            for batch in _batches(rows):
+                conn.execute(insert(model), batch)
+
+    with SessionLocal() as db:
+        rebuild(db)
+        # admin untuk route /admin (startup worker tidak lagi membuatnya)
+        ensure_admin(
+            db,
+            os.environ.get("ADMIN_USER", "admin"),
+            os.environ.get("ADMIN_PASS", "admin123"),
+        )
+    return {
+        "members": members,
+        "news": news,
+        "activities": activities,
+        "photos": len(photos),
+    }
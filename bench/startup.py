@@ -0,0 +1,83 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# dijalankan di proses baru agar tidak ada modul yang sudah ter-cache
+PROBE = """
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main as main
+t1 = time.perf_counter()
+for handler in main.app.router.on_startup:
+    result = handler()
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t2 - t1) * 1000}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Baris ``import time: self | cumulative | modul`` -> {modul: (self, cum)} (us)."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def probe() -> tuple[dict, dict[str, tuple[int, int]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(
+        result.stderr
+    )
+
+
+def run(runs: int = 5, top: int = 15) -> dict:
+    """Median waktu import ``app.main`` + startup worker dari ``runs`` proses baru."""
+    timings, modules = [], {}
+    for _ in range(runs):
+        timing, modules = probe()
+        timings.append(timing)
+    report = {
+        "runs": runs,
+        "import_ms": round(statistics.median(t["import_ms"] for t in timings), 1),
+        "startup_ms": round(statistics.median(t["startup_ms"] for t in timings), 1),
+        # dari run terakhir (cache bytecode .pyc sudah hangat)
+        "slowest_modules": [
+            {"module": name, "self_ms": s / 1000, "cumulative_ms": c / 1000}
+            for name, (s, c) in sorted(modules.items(), key=lambda kv: -kv[1][0])[
+                :top
+            ]
+        ],
+        "app_modules": {
+            name: round(c / 1000, 1)
+            for name, (_, c) in sorted(modules.items())
+            if name.startswith("app.")
+        },
+    }
+    report["total_ms"] = round(report["import_ms"] + report["startup_ms"], 1)
+    return report
+
+
+def check(report: dict, budget_ms: float | None, baseline: dict | None, tolerance):
+    """Daftar pelanggaran: melebihi anggaran, atau lebih lambat dari baseline."""
+    problems = []
+    if budget_ms and report["total_ms"] > budget_ms:
+        problems.append(f"total {report['total_ms']} ms > budget {budget_ms} ms")
+    if baseline:
+        for key in ("import_ms", "startup_ms"):
+            base = baseline.get(key)
+            if base and report[key] > base * (1 + tolerance):
+                problems.append(f"{key} {report[key]} ms vs baseline {base} ms")
+    return problems
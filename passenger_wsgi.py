@@ -1,5 +1,6 @@
 # Minimal ASGI -> WSGI adapter (HTTP only) inline untuk Passenger + FastAPI
-import os, sys, io, asyncio
+import os, sys, io, asyncio, atexit, queue, threading
+from http import HTTPStatus
 
 # pastikan cwd dan sys.path benar
 APP_DIR = os.path.dirname(__file__)
@@ -7,6 +8,11 @@ os.chdir(APP_DIR)
 if APP_DIR not in sys.path:
     sys.path.insert(0, APP_DIR)
 
+# ukuran potongan body request yang diteruskan ke receive()
+REQUEST_CHUNK_SIZE = 64 * 1024
+# jumlah potongan body response yang boleh antre sebelum app ditahan
+RESPONSE_QUEUE_SIZE = 16
+
 
 def _build_scope_from_environ(environ):
     # headers
@@ -44,78 +50,249 @@ def _build_scope_from_environ(environ):
     return scope
 
 
-def _read_body(environ):
+def _content_length(environ):
     try:
-        length = int(environ.get("CONTENT_LENGTH") or "0")
+        return max(int(environ.get("CONTENT_LENGTH") or "0"), 0)
     except ValueError:
-        length = 0
-    wsgi_input = environ.get("wsgi.input")
-    if not wsgi_input or length == 0:
-        return b""
-    return wsgi_input.read(length)
+        return 0
 
 
-def asgi_to_wsgi(app):
-    """Return a WSGI application that runs the given ASGI app (HTTP only, no websockets/streaming)."""
+class _AsgiRunner:
+    """Satu event loop permanen per proses worker + lifespan ASGI yang dijalankan sekali.
 
-    def wsgi_app(environ, start_response):
-        scope = _build_scope_from_environ(environ)
-        body_bytes = _read_body(environ)
-        # ASGI receive/send
-        received = {"sent": False}
-        response_started = {"done": False}
-        status_line = {"value": "500 Internal Server Error"}
-        resp_headers = []
+    Loop berjalan di thread daemon; request WSGI dikirim ke loop itu lewat
+    ``run_coroutine_threadsafe``. Passenger bisa fork worker setelah aplikasi
+    dimuat, jadi loop dibuat ulang bila PID berubah.
+    """
 
-        async def receive():
-            if not received["sent"]:
-                received["sent"] = True
-                return {"type": "http.request", "body": body_bytes, "more_body": False}
-            return {"type": "http.request", "body": b"", "more_body": False}
+    def __init__(self, app):
+        self.app = app
+        self.pid = None
+        self.loop = None
+        self.state = {}
+        self._lock = threading.Lock()
+        self._lifespan_queue = None
+        self._shutdown_done = None
+        atexit.register(self.shutdown)
+
+    def ensure_started(self):
+        if self.pid == os.getpid():
+            return self.loop
+        with self._lock:
+            if self.pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                t = threading.Thread(target=loop.run_forever, name="asgi-loop", daemon=True)
+                t.start()
+                self.loop = loop
+                self.state = {}
+                try:
+                    asyncio.run_coroutine_threadsafe(self._startup(), loop).result()
+                except Exception:
+                    loop.call_soon_threadsafe(loop.stop)
+                    raise
+                self.pid = os.getpid()
+        return self.loop
 
-        chunks = []
+    async def _startup(self):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        startup_done = loop.create_future()
+        shutdown_done = loop.create_future()
+
+        async def receive():
+            return await queue.get()
 
         async def send(message):
-            mtype = message.get("type")
-            if mtype == "http.response.start":
-                status = message.get("status", 200)
-                headers = message.get("headers", [])
-                status_line["value"] = f"{status} {'OK' if status==200 else ''}".strip()
-                # decode headers from bytes
-                resp_headers.clear()
-                for k, v in headers:
-                    resp_headers.append((k.decode("latin-1"), v.decode("latin-1")))
-                response_started["done"] = True
-            elif mtype == "http.response.body":
-                chunks.append(message.get("body", b"") or b"")
-            else:
-                # ignore other types for this minimal adapter
-                pass
-
-        async def app_task():
-            await app(scope, receive, send)
-
-        # run the ASGI app
+            mtype = message.get("type", "")
+            if mtype.startswith("lifespan.startup.") and not startup_done.done():
+                startup_done.set_result(message)
+            elif mtype.startswith("lifespan.shutdown.") and not shutdown_done.done():
+                shutdown_done.set_result(message)
+
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": self.state}
+        task = loop.create_task(self.app(scope, receive, send))
+        await queue.put({"type": "lifespan.startup"})
+        await asyncio.wait({startup_done, task}, return_when=asyncio.FIRST_COMPLETED)
+        if not startup_done.done():
+            # app tidak mendukung lifespan -> lanjut tanpa startup/shutdown
+            if not task.cancelled() and task.exception():
+                sys.stderr.write(f"ASGI lifespan error: {task.exception()}\n")
+            return
+        message = startup_done.result()
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(f"ASGI startup failed: {message.get('message', '')}")
+        self._lifespan_queue = queue
+        self._shutdown_done = shutdown_done
+
+    async def _shutdown(self):
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await asyncio.wait_for(self._shutdown_done, timeout=10)
+
+    def shutdown(self):
+        if self.pid != os.getpid() or self.loop is None:
+            return
         try:
-            asyncio.run(app_task())
+            if self._lifespan_queue is not None:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout=15)
         except Exception as e:
-            # jika app crash, tampilkan pesan ringkas
-            err = f"ASGI app error: {e}"
-            sys.stderr.write(err + "\n")
-            start_response(
-                "500 Internal Server Error",
-                [("Content-Type", "text/plain; charset=utf-8")],
-            )
-            return [err.encode("utf-8")]
-
-        if not response_started["done"]:
-            # jika app tidak memanggil http.response.start, set default
-            status_line["value"] = "200 OK"
-            resp_headers.append(("Content-Type", "text/plain; charset=utf-8"))
-
-        start_response(status_line["value"], resp_headers)
-        return [b"".join(chunks)]
+            sys.stderr.write(f"ASGI lifespan shutdown error: {e}\n")
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.pid = None
+
+
+class _RequestBridge:
+    """Jembatan satu request antara thread WSGI dan loop ASGI.
+
+    Body request dibaca bertahap dari ``wsgi.input`` (di executor, bukan di
+    loop), body response dialirkan lewat antrean terbatas sehingga memori per
+    request tidak bergantung pada ukuran upload/halaman.
+    """
+
+    def __init__(self, environ, loop):
+        self.loop = loop
+        self.wsgi_input = environ.get("wsgi.input")
+        self.remaining = _content_length(environ) if self.wsgi_input else 0
+        self.request_done = False
+        self.closed = False
+        self.messages = queue.Queue(maxsize=RESPONSE_QUEUE_SIZE)
+        self.disconnected = None
+
+    async def receive(self):
+        if self.disconnected is None:
+            self.disconnected = asyncio.Event()
+        if not self.request_done and not self.closed:
+            chunk = b""
+            if self.remaining > 0:
+                size = min(REQUEST_CHUNK_SIZE, self.remaining)
+                chunk = await self.loop.run_in_executor(None, self.wsgi_input.read, size)
+                chunk = chunk or b""
+                self.remaining = self.remaining - len(chunk) if chunk else 0
+            more_body = self.remaining > 0
+            self.request_done = not more_body
+            return {"type": "http.request", "body": chunk, "more_body": more_body}
+        # body sudah habis: tunggu sampai response selesai / client putus
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _put(self, item):
+        try:
+            self.messages.put_nowait(item)
+        except queue.Full:
+            await self.loop.run_in_executor(None, self._put_blocking, item)
+
+    def _put_blocking(self, item):
+        while not self.closed:
+            try:
+                self.messages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    async def send(self, message):
+        if self.closed:
+            raise OSError("client disconnected")
+        mtype = message.get("type")
+        if mtype == "http.response.start":
+            status = message.get("status", 200)
+            try:
+                phrase = HTTPStatus(status).phrase
+            except ValueError:
+                phrase = ""
+            headers = [
+                (k.decode("latin-1"), v.decode("latin-1"))
+                for k, v in message.get("headers", [])
+            ]
+            await self._put(("start", f"{status} {phrase}".strip(), headers))
+        elif mtype == "http.response.body":
+            body = message.get("body", b"") or b""
+            if body:
+                await self._put(("body", body))
+            if not message.get("more_body", False):
+                self._set_disconnected()
+        # tipe lain diabaikan oleh adapter minimal ini
+
+    def _set_disconnected(self):
+        if self.disconnected is not None:
+            self.disconnected.set()
+
+    async def run(self, app, scope):
+        exc = None
+        try:
+            await app(scope, self.receive, self.send)
+        except Exception as e:
+            exc = e
+        finally:
+            self._set_disconnected()
+            await self._put(("done", exc))
+
+    def get(self):
+        return self.messages.get()
+
+    def close(self):
+        self.closed = True
+        if self.disconnected is not None:
+            self.loop.call_soon_threadsafe(self.disconnected.set)
+
+
+def asgi_to_wsgi(app):
+    """Return a WSGI application that runs the given ASGI app (HTTP only, no websockets).
+
+    Request and response bodies are streamed in bounded chunks.
+    """
+    runner = _AsgiRunner(app)
+
+    def _error(start_response, e):
+        # jika app crash sebelum mengirim header, tampilkan pesan ringkas
+        err = f"ASGI app error: {e}"
+        sys.stderr.write(err + "\n")
+        start_response(
+            "500 Internal Server Error",
+            [("Content-Type", "text/plain; charset=utf-8")],
+        )
+        return [err.encode("utf-8")]
+
+    def _iter_body(bridge, future):
+        try:
+            while True:
+                item = bridge.get()
+                if item[0] == "body":
+                    yield item[1]
+                    continue
+                if item[0] == "done" and item[1] is not None:
+                    sys.stderr.write(f"ASGI app error: {item[1]}\n")
+                break
+        finally:
+            bridge.close()
+            if not future.done():
+                future.cancel()
+
+    def wsgi_app(environ, start_response):
+        scope = _build_scope_from_environ(environ)
+        try:
+            loop = runner.ensure_started()
+        except Exception as e:
+            return _error(start_response, e)
+        # setelah ensure_started: worker baru mengganti runner.state saat startup
+        scope["state"] = dict(runner.state)
+
+        bridge = _RequestBridge(environ, loop)
+        future = asyncio.run_coroutine_threadsafe(bridge.run(app, scope), loop)
+
+        first = bridge.get()
+        if first[0] == "done":
+            bridge.close()
+            if first[1] is not None:
+                return _error(start_response, first[1])
+            # app tidak memanggil http.response.start, set default
+            start_response("200 OK", [("Content-Type", "text/plain; charset=utf-8")])
+            return [b""]
+
+        _, status_line, resp_headers = first
+        start_response(status_line, resp_headers)
+        return _iter_body(bridge, future)
 
+    wsgi_app.runner = runner
     return wsgi_app
 
 
@@ -0,0 +1,26 @@
+import os
+import sys
+import tempfile
+
+# harus sebelum modul app diimpor: Settings membaca environment saat import
+_tmp = tempfile.mkdtemp(prefix="koperasi-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["UPLOAD_FOLDER"] = os.path.join(_tmp, "uploads")
+os.environ["CACHE_DIR"] = os.path.join(_tmp, ".cache")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.schema import ensure_schema  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    ensure_schema(engine)
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
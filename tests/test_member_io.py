@@ -0,0 +1,67 @@
+import io
+from datetime import date
+
+from app.member_io import import_members
+from app.models.member import Member
+
+
+def _csv(text: str):
+    return io.BytesIO(text.encode())
+
+
+def test_update_keeps_columns_missing_from_file(db):
+    db.add(
+        Member(
+            name="Sari",
+            email="sari@contoh.id",
+            phone="0811",
+            address="Jl. Mawar 1",
+            occupation="Guru",
+            dob=date(1990, 5, 1),
+            membership_type="Premium",
+        )
+    )
+    db.commit()
+
+    report = import_members(
+        db,
+        _csv("name,email,phone\nSari Dewi,SARI@contoh.id,0822\n"),
+        "anggota.csv",
+        update=True,
+    )
+
+    assert report.updated == 1 and not report.errors
+    db.expire_all()
+    member = db.query(Member).filter_by(email="sari@contoh.id").one()
+    assert (member.name, member.phone) == ("Sari Dewi", "0822")
+    assert member.address == "Jl. Mawar 1"
+    assert member.occupation == "Guru"
+    assert member.dob == date(1990, 5, 1)
+    assert member.membership_type == "Premium"
+
+
+def test_update_ignores_empty_cells(db):
+    db.add(
+        Member(
+            name="Budi",
+            email="budi@contoh.id",
+            phone="0813",
+            occupation="Petani",
+            membership_type="Pelajar",
+        )
+    )
+    db.commit()
+
+    report = import_members(
+        db,
+        _csv(
+            "name,email,phone,occupation,membership_type\nBudi,budi@contoh.id,0813,,\n"
+        ),
+        "anggota.csv",
+        update=True,
+    )
+
+    assert report.updated == 1
+    db.expire_all()
+    member = db.query(Member).filter_by(email="budi@contoh.id").one()
+    assert (member.occupation, member.membership_type) == ("Petani", "Pelajar")